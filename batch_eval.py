@@ -0,0 +1,129 @@
+# batch_eval.py
+# Vektorové hodnocení mnoha pozic najednou pomocí NumPy.
+# Počítá stejné složky jako heuristics.evaluate_position (bez penalizace
+# za repetici, ta závisí na historii partie) pro N pozic jedním voláním.
+#
+# Pozice jsou pole tvaru (N, 8, 8) s kódy:
+#   0 prázdné, 1 bílý pěšec, 2 bílá dáma, -1 černý pěšec, -2 černá dáma
+# nebo zabalené bitboardy tvaru (N, 3): bílí, černí, dámy (viz bitboard.py).
+
+import numpy as np
+
+from heuristics import (W_CAPTURE, W_CENTER, W_FORMATION, W_KING, W_MOB, W_PROMO,
+                        W_THREAT, CENTER_COLS, CENTER_ROWS)
+
+DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+_CODES = {("white", "pawn"): 1, ("white", "queen"): 2, ("black", "pawn"): -1, ("black", "queen"): -2}
+
+_ROWS = np.arange(8).reshape(1, 8, 1)
+_CENTER = np.zeros((1, 8, 8), dtype=bool)
+_CENTER[0, CENTER_ROWS.start:CENTER_ROWS.stop, CENTER_COLS.start:CENTER_COLS.stop] = True
+
+
+def pack_boards(boards):
+    """Převede desky (Board, BitBoard) na pole (N, 8, 8) kódů"""
+    out = np.zeros((len(boards), 8, 8), dtype=np.int8)
+    for i, board in enumerate(boards):
+        for x, row in enumerate(board.pole):
+            for y, piece in enumerate(row):
+                if piece != 0:
+                    out[i, x, y] = _CODES[piece.color, piece.type]
+    return out
+
+
+def pack_bitboards(boards):
+    """Zabalí BitBoardy do pole (N, 3) uint64 [bílí, černí, dámy]"""
+    return np.array([(b.white, b.black, b.queens) for b in boards], dtype=np.uint64)
+
+
+def unpack_bitboards(bitboards):
+    """Převede zabalené bitboardy (N, 3) [bílí, černí, dámy] na pole (N, 8, 8)"""
+    bb = np.asarray(bitboards, dtype=np.uint64)
+    bits = np.arange(64, dtype=np.uint64)
+    white = ((bb[:, 0:1] >> bits) & np.uint64(1)).astype(np.int8)
+    black = ((bb[:, 1:2] >> bits) & np.uint64(1)).astype(np.int8)
+    queen = ((bb[:, 2:3] >> bits) & np.uint64(1)).astype(np.int8)
+    return ((white - black) * (1 + queen)).reshape(-1, 8, 8)
+
+
+def shift(mask, dx, dy):
+    """Posune masky (N, 8, 8) o (dx, dy): sloupce se otáčí (np.roll), řádky odpadají"""
+    rolled = np.roll(mask, dy, axis=2)
+    out = np.zeros_like(rolled)
+    if dx > 0:
+        out[:, dx:, :] = rolled[:, :-dx, :]
+    else:
+        out[:, :dx, :] = rolled[:, -dx:, :]
+    return out
+
+
+def _count(mask):
+    return mask.sum(axis=(1, 2))
+
+
+def _side_terms(own, enemy, queens, forward, empty):
+    """Složky jedné strany: (kroky, skoky, ohrožené soupeřovy figurky jako maska)"""
+    steps = np.zeros(own.shape[0], dtype=np.int64)
+    jumps = np.zeros(own.shape[0], dtype=np.int64)
+    captured = np.zeros_like(own)
+    for dx, dy in DIRECTIONS:
+        movers = own if dx == forward else own & queens
+        near = shift(movers, dx, dy)
+        steps += _count(near & empty)
+        over = near & enemy
+        jumps += _count(shift(over, dx, dy) & empty)
+        captured |= over & shift(empty, -dx, -dy)
+    return steps, jumps, captured
+
+
+def _pairs(mask):
+    total = np.zeros(mask.shape[0], dtype=np.int64)
+    for dx, dy in DIRECTIONS:
+        total += _count(mask & shift(mask, dx, dy))
+    return total // 2
+
+
+def evaluate_batch(positions, me_color="white"):
+    """
+    Vrátí pole N skóre (float64) z pohledu me_color. me_color je buď jedna
+    barva pro všechny pozice, nebo posloupnost barev délky N.
+    Pole tvaru (N, 3) se bere jako zabalené bitboardy.
+    """
+    a = np.asarray(positions)
+    if a.ndim == 2 and a.shape[1] == 3:
+        a = unpack_bitboards(a)
+    a = a.astype(np.int8, copy=False)
+
+    white = a > 0
+    black = a < 0
+    queens = (a == 2) | (a == -2)
+    empty = a == 0
+    pawns = ~queens & ~empty
+
+    w_steps, w_jumps, b_captured = _side_terms(white, black, queens, 1, empty)
+    b_steps, b_jumps, w_captured = _side_terms(black, white, queens, -1, empty)
+
+    w_material = _count(white & pawns) + W_KING * _count(white & queens)
+    b_material = _count(black & pawns) + W_KING * _count(black & queens)
+    w_moves = np.where(w_jumps > 0, w_jumps, w_steps)
+    b_moves = np.where(b_jumps > 0, b_jumps, b_steps)
+    w_promo = ((white & pawns).astype(np.int64) * _ROWS).sum(axis=(1, 2))
+    b_promo = ((black & pawns).astype(np.int64) * (7 - _ROWS)).sum(axis=(1, 2))
+    w_center = _count(white & _CENTER)
+    b_center = _count(black & _CENTER)
+
+    # Skóre z pohledu bílého bez asymetrické složky (hrozby jen vlastním figurkám)
+    diff = ((w_material - b_material)
+            + W_MOB * (w_moves - b_moves)
+            + W_CAPTURE * ((w_jumps > 0).astype(np.int64) - (b_jumps > 0))
+            + W_PROMO * (w_promo - b_promo) / 7.0
+            + W_CENTER * (w_center - b_center)
+            + W_FORMATION * (_pairs(white) - _pairs(black)))
+
+    if isinstance(me_color, str):
+        me_white = np.full(a.shape[0], me_color == "white")
+    else:
+        me_white = np.asarray([c == "white" for c in me_color])
+    threatened = np.where(me_white, _count(w_captured), _count(b_captured))
+    return np.where(me_white, diff, -diff) - W_THREAT * threatened
@@ -0,0 +1,200 @@
+# bench.py
+# Benchmark generátoru tahů, hodnoticí funkce a prohledávání.
+# Výsledky se porovnají s uloženými hodnotami v bench_baseline.json;
+# zpomalení o víc než --threshold (podíl) je regrese a skript skončí kódem 1.
+#
+#   python bench.py                 # změří a porovná se základem
+#   python bench.py --save          # změří a uloží jako nový základ
+#
+# Čísla závisí na stroji - základ je nutné uložit na stejném počítači.
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from bitboard import BitBoard
+from game import Game
+from heuristics import evaluate_position, opp
+from movegen import generate_moves
+from perft import POSITIONS, parse_position, perft
+from player import Player
+from search import Search
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+
+def _best_time(fn, repeat):
+    """Nejkratší čas z několika opakování (nejméně zatížený běh)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _game_for(board):
+    return Game(Player("white"), Player("black"), board=board)
+
+
+def sample_positions(count=200, seed=1):
+    """Pozice z náhodných partií (opakovatelné díky semínku)"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board, color = parse_position(POSITIONS["start"])
+        for _ in range(rng.randint(0, 40)):
+            moves = generate_moves(board, color)
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            color = opp(color)
+        positions.append((board, color))
+    return positions
+
+
+def _as_bitboard(board):
+    """Stejná pozice na BitBoardu"""
+    bitboard = BitBoard()
+    bitboard.pole = board.pole
+    return bitboard
+
+
+def bench_movegen(repeat, bitboard=False):
+    """Listy perftu za sekundu přes všechny uložené pozice"""
+    jobs = []
+    for name, text in POSITIONS.items():
+        board, color = parse_position(text)
+        if bitboard:
+            board = _as_bitboard(board)
+        jobs.append((board, color, 6 if name == "start" else 5))
+
+    def run():
+        return sum(perft(board, color, depth) for board, color, depth in jobs)
+
+    elapsed, leaves = _best_time(run, repeat)
+    return leaves / elapsed
+
+
+def bench_eval(repeat):
+    """Volání evaluate_position za sekundu"""
+    games = [(_game_for(board), color) for board, color in sample_positions(1000)]
+
+    def run():
+        for game, color in games:
+            evaluate_position(game, color)
+        return len(games)
+
+    elapsed, count = _best_time(run, repeat)
+    return count / elapsed
+
+
+def bench_batch_eval(repeat):
+    """Pozice za sekundu při dávkovém hodnocení (batch_eval, NumPy)"""
+    import batch_eval
+    positions = sample_positions(1000)
+    packed = batch_eval.pack_boards([board for board, _ in positions])
+    colors = [color for _, color in positions]
+
+    def run():
+        return len(batch_eval.evaluate_batch(packed, colors))
+
+    elapsed, count = _best_time(run, repeat)
+    return count / elapsed
+
+
+def bench_search(repeat, bitboard=False):
+    """Uzly prohledávání za sekundu při pevné hloubce"""
+    depth = 5
+
+    def run():
+        nodes = 0
+        for text in POSITIONS.values():
+            board, color = parse_position(text)
+            if bitboard:
+                board = _as_bitboard(board)
+            search = Search(_game_for(board), time_limit=None, max_depth=depth)
+            search.iterate(color)
+            nodes += search.nodes
+        return nodes
+
+    elapsed, nodes = _best_time(run, repeat)
+    return nodes / elapsed
+
+
+BENCHMARKS = {
+    "movegen_leaves_per_sec": bench_movegen,
+    "evaluations_per_sec": bench_eval,
+    "search_nodes_per_sec": bench_search,
+    # Totéž na BitBoardu (generátor tahů a hodnocení nad maskami)
+    "bitboard_movegen_leaves_per_sec": lambda repeat: bench_movegen(repeat, bitboard=True),
+    "bitboard_search_nodes_per_sec": lambda repeat: bench_search(repeat, bitboard=True),
+}
+
+try:
+    import numpy  # noqa: F401
+    BENCHMARKS["batch_evaluations_per_sec"] = bench_batch_eval
+except ImportError:
+    pass
+
+
+def run_benchmarks(repeat=3):
+    return {name: fn(repeat) for name, fn in BENCHMARKS.items()}
+
+
+def compare(results, baseline, threshold):
+    """Vrátí seznam (metrika, hodnota, základ, poměr, regrese?)"""
+    rows = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, value, None, None, False))
+            continue
+        ratio = value / base
+        rows.append((name, value, base, ratio, ratio < 1.0 - threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generátoru tahů, hodnocení a hledání.")
+    parser.add_argument("--baseline", default=BASELINE, help="soubor se základními hodnotami")
+    parser.add_argument("--save", action="store_true", help="uložit výsledky jako nový základ")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="povolené zpomalení proti základu (0.15 = 15 %%)")
+    parser.add_argument("--repeat", type=int, default=3, help="počet opakování každého měření")
+    parser.add_argument("--output", help="soubor pro výsledky (JSON)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeat)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    regression = False
+    for name, value, base, ratio, bad in compare(results, baseline, args.threshold):
+        line = f"{name:32s} {value:14,.0f}"
+        if base is not None:
+            line += f"   základ {base:14,.0f}   {ratio:6.2f}×"
+        if bad:
+            line += "   REGRESE"
+            regression = True
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({name: round(value, 1) for name, value in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"Základ uložen do {args.baseline}")
+    return 1 if regression and not args.save else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# bitboard.py
+# Alternativní reprezentace desky pomocí 64bitových bitboardů.
+# Bit s indexem x * 8 + y odpovídá poli [x][y]. Řádky (x) mají okraj,
+# sloupce (y) jsou kruhové - posun o sloupec je rotace v rámci každého řádku.
+
+from board import Board
+from heuristics import opp
+from movegen import CAPTURE_SHIFT, move_to
+from piece import BLACK_PAWN, PAWN, QUEEN, WHITE, WHITE_PAWN
+from symmetry import SYM_KEYS
+from zobrist import PIECE_KEYS
+
+FULL = 0xFFFFFFFFFFFFFFFF
+COL0 = 0x0101010101010101           # sloupec y = 0 ve všech řádcích
+COL7 = COL0 << 7                    # sloupec y = 7 ve všech řádcích
+NOT_COL0 = FULL ^ COL0
+NOT_COL7 = FULL ^ COL7
+
+DIRECTIONS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def bit(x, y):
+    """Vrátí masku s jediným bitem pro pole [x][y]"""
+    return 1 << (x * 8 + y % 8)
+
+
+def popcount(bb):
+    """Počet nastavených bitů"""
+    return bin(bb).count("1")
+
+
+def iter_bits(bb):
+    """Postupně vrací indexy nastavených bitů (od nejnižšího)"""
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def rot_right(bb):
+    """Posune všechna pole o sloupec doprava (y + 1), rotace v rámci řádku"""
+    return ((bb << 1) & NOT_COL0) | ((bb >> 7) & COL0)
+
+
+def rot_left(bb):
+    """Posune všechna pole o sloupec doleva (y - 1), rotace v rámci řádku"""
+    return ((bb >> 1) & NOT_COL7) | ((bb << 7) & COL7)
+
+
+def shift(bb, dx, dy):
+    """Posune masku o (dx, dy); řádky mimo desku odpadnou, sloupce se otáčí"""
+    bb = rot_right(bb) if dy > 0 else rot_left(bb)
+    if dx > 0:
+        return (bb << 8) & FULL
+    return bb >> 8
+
+
+class _Row:
+    """Pohled na jeden řádek bitboardu, chová se jako list figurek"""
+
+    def __init__(self, board, x):
+        self.board = board
+        self.base = x * 8
+
+    def __getitem__(self, y):
+        return self.board.squares[self.base + y % 8]
+
+    def __setitem__(self, y, piece):
+        self.board.set_piece(self.base >> 3, y, piece)
+
+    def __iter__(self):
+        return iter(self.board.squares[self.base:self.base + 8])
+
+    def __len__(self):
+        return 8
+
+
+class _Pole:
+    """Pohled na bitboard se stejným rozhraním jako Board.pole (pole[x][y])"""
+
+    def __init__(self, board):
+        self.rows = tuple(_Row(board, x) for x in range(8))
+
+    def __getitem__(self, x):
+        if not 0 <= x < 8:
+            raise IndexError(x)
+        return self.rows[x]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return 8
+
+
+class BitBoard(Board):
+    """
+    Deska uložená ve třech 64bitových maskách: bílí, černí a dámy.
+    generate_moves a výčty figurek pracují s maskami; pro přístup po polích
+    (board.pole, piece_at) je vedle nich seznam figurek po polích (squares).
+    """
+    bitboard = True
+
+    def __init__(self):
+        self.white = 0
+        self.black = 0
+        self.queens = 0
+        self.squares = [0] * 64
+        self.key = 0
+        self.sym_key = 0
+        self._pole = _Pole(self)
+        self.setup_pieces()
+
+    @property
+    def pole(self):
+        return self._pole
+
+    @pole.setter
+    def pole(self, rows):
+        """Načte desku z matice 8×8 (0 nebo Piece)"""
+        self.white = self.black = self.queens = 0
+        self.squares = [0] * 64
+        for x in range(8):
+            for y in range(8):
+                self.set_piece(x, y, rows[x][y])
+        self.refresh_key()
+
+    def setup_pieces(self):
+        """Rozmístí počáteční figurky na desku"""
+        for j in range(4):
+            for x, y in ((0, j * 2 + 1), (1, j * 2)):
+                self._put(x * 8 + y, WHITE_PAWN)
+            for x, y in ((6, j * 2 + 1), (7, j * 2)):
+                self._put(x * 8 + y, BLACK_PAWN)
+        self.refresh_key()
+
+    def piece_at(self, x, y):
+        """Vrátí figurku na poli [x][y] nebo 0"""
+        return self.squares[x * 8 + y % 8]
+
+    def set_piece(self, x, y, piece):
+        """Položí figurku (nebo 0) na pole [x][y] a aktualizuje zobrist klíč"""
+        self._put(x * 8 + y % 8, piece)
+
+    def _put(self, sq, piece):
+        """set_piece podle indexu pole: masky, seznam figurek i oba klíče"""
+        old = self.squares[sq]
+        b = 1 << sq
+        if old != 0:
+            self.key ^= PIECE_KEYS[old.code][sq]
+            self.sym_key ^= SYM_KEYS[old.code][sq]
+            if old.color_code == WHITE:
+                self.white ^= b
+            else:
+                self.black ^= b
+            if old.type_code == QUEEN:
+                self.queens ^= b
+        if piece != 0:
+            self.key ^= PIECE_KEYS[piece.code][sq]
+            self.sym_key ^= SYM_KEYS[piece.code][sq]
+            if piece.color_code == WHITE:
+                self.white |= b
+            else:
+                self.black |= b
+            if piece.type_code == QUEEN:
+                self.queens |= b
+        self.squares[sq] = piece
+
+    def make_move(self, move):
+        """Board.make_move přímo nad indexy polí (bez board.pole)"""
+        frm, to = move & 63, move_to(move)
+        squares = self.squares
+        piece = squares[frm]
+        captured = []
+        mask = move >> CAPTURE_SHIFT
+        for sq in iter_bits(mask):
+            mx, my = divmod(sq, 8)
+            captured.append((mx, my, squares[sq]))
+            self._put(sq, 0)
+        self._put(frm, 0)
+        if piece.type_code == PAWN and to >> 3 == (7 if piece.color_code == WHITE else 0):
+            self._put(to, piece.promoted())
+        else:
+            self._put(to, piece)
+        if self.evaluator is not None:
+            touched = [frm, to]
+            touched.extend(mx * 8 + my for mx, my, _ in captured)
+            self.evaluator.update(touched)
+        return move, piece, captured
+
+    def unmake_move(self, undo):
+        """Vrátí tah provedený metodou make_move"""
+        move, piece, captured = undo
+        self._put(move_to(move), 0)
+        self._put(move & 63, piece)
+        for mx, my, victim in captured:
+            self._put(mx * 8 + my, victim)
+        if self.evaluator is not None:
+            self.evaluator.undo()
+
+    def je_volne(self, x, y):
+        """Kontroluje, zda je pole prázdné"""
+        return not (self.white | self.black) & bit(x, y)
+
+    def masks(self, color):
+        """Vrátí (vlastní, soupeřovy) figurky pro danou barvu"""
+        if color == "white":
+            return self.white, self.black
+        return self.black, self.white
+
+    def movers(self, color, dx):
+        """Figurky dané barvy, které smí táhnout směrem dx"""
+        own, _ = self.masks(color)
+        forward = 1 if color == "white" else -1
+        return own if dx == forward else own & self.queens
+
+    def step_targets(self, color):
+        """Pro každý směr masku cílových polí prostých kroků"""
+        empty = FULL ^ (self.white | self.black)
+        return {(dx, dy): shift(self.movers(color, dx), dx, dy) & empty
+                for dx, dy in DIRECTIONS}
+
+    def jump_targets(self, color):
+        """Pro každý směr masku cílových polí skoků"""
+        _, enemy = self.masks(color)
+        empty = FULL ^ (self.white | self.black)
+        return {(dx, dy): shift(shift(self.movers(color, dx), dx, dy) & enemy, dx, dy) & empty
+                for dx, dy in DIRECTIONS}
+
+    def threatened(self, color):
+        """Maska figurek dané barvy, které může soupeř hned přeskočit"""
+        own, enemy = self.masks(color)
+        empty = FULL ^ (self.white | self.black)
+        opp_color = opp(color)
+        threat = 0
+        for dx, dy in DIRECTIONS:
+            over = shift(self.movers(opp_color, dx), dx, dy) & own
+            threat |= over & shift(empty, -dx, -dy)
+        return threat
+
+    def vsechny_figurky(self):
+        """Vrátí seznamy souřadnic (bílé, černé) figurek"""
+        return ([divmod(sq, 8) for sq in iter_bits(self.white)],
+                [divmod(sq, 8) for sq in iter_bits(self.black)])
+
+    def pocetfigurek(self):
+        """Spočítá počet figurek každé barvy na desce"""
+        return popcount(self.white), popcount(self.black)
+
+    def no_moves_available(self, color):
+        """Kontroluje, zda hráč s danou barvou má k dispozici platné tahy"""
+        for mask in self.jump_targets(color).values():
+            if mask:
+                return False
+        for mask in self.step_targets(color).values():
+            if mask:
+                return False
+        return True
+
+    def moznostSkoku(self, color):
+        """Kontroluje, zda má hráč k dispozici nějaké možné skoky"""
+        return any(self.jump_targets(color).values())
@@ -1,17 +1,92 @@
-from piece import Piece
+from piece import BLACK_PAWN, PAWN, WHITE, WHITE_PAWN
+from movegen import CAPTURE_SHIFT, generate_moves, captures_available, move_to
+from symmetry import SYM_KEYS, symmetric_key
+from zobrist import board_key, piece_key
 
 class Board:
+    # Průběžné hodnocení (např. IncrementalEvaluator) s update(pole) a undo();
+    # je-li připojeno, make_move a unmake_move ho udržují spolu s deskou
+    evaluator = None
+    # Deska uložená v maskách (BitBoard); generate_moves pak čte masky místo pole
+    bitboard = False
+
     def __init__(self): # matice s bud 0 nebo figurkou, říká kde jsou jaké figurky
         self.pole = [[0 for _ in range(8)] for _ in range(8)]
+        self.key = 0  # zobrist klíč rozmístění figurek
+        self.sym_key = 0  # klíče všech 16 symetrických obrazů (symmetry.py)
         self.setup_pieces()
-        
+
     def setup_pieces(self):
         """Rozmístí počáteční figurky na desku"""
         for j in range(4):
-            self.pole[0][j * 2 + 1] = Piece("white", "pawn")
-            self.pole[1][j * 2] = Piece("white", "pawn")
-            self.pole[6][j * 2 + 1] = Piece("black", "pawn")
-            self.pole[7][j * 2] = Piece("black", "pawn")
+            self.pole[0][j * 2 + 1] = WHITE_PAWN
+            self.pole[1][j * 2] = WHITE_PAWN
+            self.pole[6][j * 2 + 1] = BLACK_PAWN
+            self.pole[7][j * 2] = BLACK_PAWN
+        self.refresh_key()
+
+    def refresh_key(self):
+        """Přepočítá zobrist klíče; nutné po ručních zápisech do self.pole"""
+        self.key = board_key(self)
+        self.sym_key = symmetric_key(self)
+
+    def copy(self):
+        """Nezávislá kopie desky stejného typu (stejné figurky i klíč)"""
+        board = type(self)()
+        board.pole = [list(row) for row in self.pole]
+        board.refresh_key()
+        return board
+
+    def set_piece(self, x, y, piece):
+        """Položí figurku (nebo 0) na pole [x][y] a aktualizuje zobrist klíč"""
+        old = self.pole[x][y]
+        if old != 0:
+            self.key ^= piece_key(old, x, y)
+            self.sym_key ^= SYM_KEYS[old.code][x * 8 + y]
+        if piece != 0:
+            self.key ^= piece_key(piece, x, y)
+            self.sym_key ^= SYM_KEYS[piece.code][x * 8 + y]
+        self.pole[x][y] = piece
+
+    def make_move(self, move):
+        """
+        Provede tah z generate_moves (celý řetězec skoků včetně braní a proměny)
+        a vrátí záznam pro unmake_move. Zobrist klíč i připojené hodnocení
+        se aktualizují.
+        """
+        x1, y1 = divmod(move & 63, 8)
+        x2, y2 = divmod(move >> (4 + 6 * (move >> 6 & 15)) & 63, 8)   # = move_to(move)
+        pole = self.pole
+        piece = pole[x1][y1]
+        captured = []
+        mask = move >> CAPTURE_SHIFT
+        while mask:
+            low = mask & -mask
+            mx, my = divmod(low.bit_length() - 1, 8)
+            captured.append((mx, my, pole[mx][my]))
+            self.set_piece(mx, my, 0)
+            mask ^= low
+        self.set_piece(x1, y1, 0)
+        if piece.type_code == PAWN and x2 == (7 if piece.color_code == WHITE else 0):
+            self.set_piece(x2, y2, piece.promoted())
+        else:
+            self.set_piece(x2, y2, piece)
+        if self.evaluator is not None:
+            touched = [x1 * 8 + y1, x2 * 8 + y2]
+            touched.extend(mx * 8 + my for mx, my, _ in captured)
+            self.evaluator.update(touched)
+        return move, piece, captured
+
+    def unmake_move(self, undo):
+        """Vrátí tah provedený metodou make_move (záznamy se vrací v obráceném pořadí)"""
+        move, piece, captured = undo
+        x2, y2 = divmod(move_to(move), 8)
+        self.set_piece(x2, y2, 0)
+        self.set_piece(*divmod(move & 63, 8), piece)
+        for mx, my, victim in captured:
+            self.set_piece(mx, my, victim)
+        if self.evaluator is not None:
+            self.evaluator.undo()
 
     def je_v_poli(self, x, y):
         """Kontroluje, zda jsou souřadnice v rámci desky"""
@@ -63,9 +138,9 @@ class Board:
             raise ValueError("Cílové pole není volné.")
 
         # Provede skok
-        self.pole[x2][y2] = figurka
-        self.pole[x1][y1] = 0
-        self.pole[jumped_x][jumped_y] = 0  # maže přeskočenou figurku
+        self.set_piece(x2, y2, figurka)
+        self.set_piece(x1, y1, 0)
+        self.set_piece(jumped_x, jumped_y, 0)  # maže přeskočenou figurku
         
         # Kontroluje stav hry
         game_status = self.check_game_status()
@@ -105,50 +180,23 @@ class Board:
                         cerni += 1
         return bili, cerni
 
-    def no_moves_available(self, color):
-        """Kontroluje, zda hráč s danou barvou má k dispozici platné tahy"""
+    def vsechny_figurky(self):
+        """Vrátí seznamy souřadnic (bílé, černé) figurek"""
+        bile, cerne = [], []
         for i in range(8):
             for j in range(8):
-                piece = self.pole[i][j]
-                if piece != 0 and piece.color == color:
-                    # Kontrola možných skoků
-                    for dx, dy in piece.skok():
-                        x2, y2 = i + dx, (j + dy) % 8
-                        if self.je_v_poli(x2, y2) and self.je_volne(x2, y2):
-                            mx = (i + x2) // 2
-                            my = self.middle_col(j, y2)
-                            victim = self.pole[mx][my]
-                            if victim != 0 and victim.color != color:
-                                # Nalezen platný skok
-                                return False
-                    
-                    # Kontrola možných tahů (pokud nejsou skoky)
-                    for dx, dy in piece.krok():
-                        x2, y2 = i + dx, (j + dy) % 8
-                        if self.je_v_poli(x2, y2) and self.je_volne(x2, y2):
-                            if piece.type == "queen" or (
-                                (color == "white" and dx > 0) or 
-                                (color == "black" and dx < 0)
-                            ):
-                                # Nalezen platný tah
-                                return False
-        
-        # Nenalezeny žádné platné tahy
-        return True
+                figurka = self.pole[i][j]
+                if figurka:
+                    if figurka.color_code == WHITE:
+                        bile.append((i, j))
+                    else:
+                        cerne.append((i, j))
+        return bile, cerne
+
+    def no_moves_available(self, color):
+        """Kontroluje, zda hráč s danou barvou má k dispozici platné tahy"""
+        return not generate_moves(self, color)
 
     def moznostSkoku(self, color):
         """Kontroluje, zda má hráč k dispozici nějaké možné skoky"""
-        for i in range(8):
-            for j in range(8):
-                piece = self.pole[i][j]
-                if piece != 0 and piece.color == color:
-                    for dx, dy in piece.skok():
-                        x2, y2 = i + dx, (j + dy) % 8
-                        if self.je_v_poli(x2, y2) and self.je_volne(x2, y2):
-                            mx = (i + x2) // 2
-                            my = self.middle_col(j, y2)
-                            victim = self.pole[mx][my]
-                            if victim != 0 and victim.color != color:
-                                return True
-        return False
-
+        return captures_available(generate_moves(self, color))
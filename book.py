@@ -0,0 +1,230 @@
+# book.py
+# Knihovna zahájení: seřazený binární soubor (klíč pozice, tah, statistika).
+# Za běhu se soubor mapuje do paměti (mmap) a hledá se v něm půlením
+# intervalu, takže se nenačítá celý a více procesů sdílí stejné stránky.
+#
+#   python book.py --games 500 --plies 10 --workers 8 --output opening.book
+#   python book.py --search-plies 3 --nodes 20000 --output opening.book
+#
+# Formát souboru (little-endian):
+#   hlavička  MAGIC (8 B), verze (uint32), počet záznamů (uint32)
+#   záznam    klíč pozice (uint64), tah (celé číslo z movegen, MOVE_BYTES B),
+#             váha (uint32), průměrný výsledek v [-1, 1] z pohledu hráče na tahu (float32)
+# Záznamy jsou seřazené podle (klíč, tah); jedna pozice může mít více tahů.
+# Klíč je kanonický klíč pozice (symmetry.py) a tah je uložen v kanonické
+# podobě, takže symetrické pozice sdílí záznamy.
+
+import argparse
+import math
+import mmap
+import struct
+
+from board import Board
+from game import Game
+from heuristics import opp
+from movegen import MOVE_BYTES, generate_moves
+from search import WIN_THRESHOLD, Search
+from symmetry import canonical_key, transform_move, untransform_move
+
+MAGIC = b"DAMABOOK"
+VERSION = 3
+HEADER = struct.Struct("<8sII")
+RECORD = struct.Struct(f"<Q{MOVE_BYTES}sIf")
+KEY = struct.Struct("<Q")
+
+DEFAULT_PATH = "opening.book"
+
+# Váha pomyslných remíz (skóre 0), které se přimíchají k průměru tahu při
+# výběru: málo hraný tah se tak nepřehoupne přes tah ověřený mnoha partiemi
+PRIOR_WEIGHT = 4
+
+# Skóre hledání se do knihovny ukládá jako očekávaný výsledek v [-1, 1]
+# (stejná stupnice jako výsledky her): tanh(skóre / SCORE_SCALE), výhra ±1
+SCORE_SCALE = 2.0
+
+
+def score_to_result(score):
+    """Skóre hledání (v pěšcích) převedené na očekávaný výsledek v [-1, 1]"""
+    if abs(score) >= WIN_THRESHOLD:
+        return 1.0 if score > 0 else -1.0
+    return math.tanh(score / SCORE_SCALE)
+
+
+class BookBuilder:
+    """Sbírá (klíč, tah) -> [váha, součet skóre] a zapíše je jako soubor knihovny"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def add(self, key, move, score, weight=1):
+        entry = self.entries.setdefault((key, move), [0, 0.0])
+        entry[0] += weight
+        entry[1] += score * weight
+
+    def add_position(self, board, color, move, score, weight=1):
+        """Přidá tah v pozici (uloží se pod kanonickým klíčem)"""
+        key, transform = canonical_key(board, color)
+        self.add(key, transform_move(move, transform), score, weight)
+
+    def add_game(self, moves, winner, plies):
+        """Přidá prvních plies půltahů jedné hry; skóre +1 výhra, 0 remíza, -1 prohra"""
+        board = Board()
+        color = "white"
+        for move in moves[:plies]:
+            score = 0.0 if winner is None else (1.0 if winner == color else -1.0)
+            self.add_position(board, color, move, score)
+            board.make_move(move)
+            color = opp(color)
+
+    def write(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.entries)))
+            for (key, move), (weight, total) in sorted(self.entries.items()):
+                f.write(RECORD.pack(key, move.to_bytes(MOVE_BYTES, "little"), weight, total / weight))
+
+
+def build_from_selfplay(games, plies=10, seed=0, workers=None, ai_options=None, random_opening=2):
+    """Knihovna z her AI proti AI (viz selfplay.run_games)"""
+    import selfplay
+    builder = BookBuilder()
+    for result in selfplay.run_games(games, seed, workers, ai_options,
+                                     random_opening=random_opening):
+        builder.add_game(result["moves"], result["winner"], plies)
+    return builder
+
+
+def build_from_search(plies=3, node_limit=20000, max_depth=64):
+    """
+    Knihovna z hlubšího prohledávání: pro každou pozici dosažitelnou
+    z výchozí do plies půltahů uloží nejlepší tah a jeho skóre
+    (převedené score_to_result, aby bylo srovnatelné s výsledky her).
+    """
+    from player import Player       # player importuje book
+    builder = BookBuilder()
+    seen = set()
+
+    def visit(board, color, depth):
+        key, _ = canonical_key(board, color)
+        if key in seen:
+            return
+        seen.add(key)
+        moves = generate_moves(board, color)
+        if not moves:
+            return
+        game = Game(Player("white"), Player("black"), board=board)
+        search = Search(game, time_limit=None, node_limit=node_limit, max_depth=max_depth)
+        move = search.iterate(color)
+        builder.add_position(board, color, move, score_to_result(search.best_score or 0.0))
+        if depth > 1:
+            for move in moves:
+                child = board.copy()
+                child.make_move(move)
+                visit(child, opp(color), depth - 1)
+
+    visit(Board(), "white", plies)
+    return builder
+
+
+class OpeningBook:
+    """Knihovna zahájení namapovaná do paměti (jen pro čtení)"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:          # prázdný soubor nelze namapovat
+            self._file.close()
+            raise ValueError(f"Soubor knihovny {path!r} je prázdný.")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"Soubor {path!r} není knihovna zahájení.")
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or len(self._map) != HEADER.size + count * RECORD.size:
+            self.close()
+            raise ValueError(f"Soubor {path!r} není knihovna zahájení (verze {VERSION}).")
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _key_at(self, index):
+        return KEY.unpack_from(self._map, HEADER.size + index * RECORD.size)[0]
+
+    def probe(self, key):
+        """
+        Seznam (tah, váha, skóre) pro kanonický klíč pozice (prázdný, není-li
+        v knihovně); tahy jsou v kanonické podobě.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        result = []
+        while lo < self.count:
+            k, move, weight, score = RECORD.unpack_from(self._map, HEADER.size + lo * RECORD.size)
+            if k != key:
+                break
+            result.append((int.from_bytes(move, "little"), weight, score))
+            lo += 1
+        return result
+
+    def choose(self, board, color, min_weight=1, rng=None):
+        """
+        Tah z knihovny pro danou pozici, nebo None. Bere se tah s nejlepším
+        průměrným skóre staženým k nule podle počtu partií (viz PRIOR_WEIGHT),
+        při shodě častější; s rng se mezi tahy se stejným skóre volí náhodně
+        úměrně váze. Tahy se ověří proti generátoru.
+        """
+        key, transform = canonical_key(board, color)
+        entries = [(untransform_move(move, transform), weight, score)
+                   for move, weight, score in self.probe(key) if weight >= min_weight]
+        if not entries:
+            return None
+        legal = set(generate_moves(board, color))
+        entries = [e for e in entries if e[0] in legal]
+        if not entries:
+            return None
+        entries = [(move, weight, score * weight / (weight + PRIOR_WEIGHT))
+                   for move, weight, score in entries]
+        best = max(score for _, _, score in entries)
+        entries = [e for e in entries if e[2] == best]
+        if rng is not None:
+            return rng.choices([e[0] for e in entries], [e[1] for e in entries])[0]
+        return max(entries, key=lambda e: e[1])[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sestavení knihovny zahájení.")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="výstupní soubor knihovny")
+    parser.add_argument("--games", type=int, default=200, help="počet her AI proti AI")
+    parser.add_argument("--plies", type=int, default=10, help="kolik půltahů každé hry uložit")
+    parser.add_argument("--workers", type=int, default=None, help="počet procesů")
+    parser.add_argument("--seed", type=int, default=0, help="základní semínko")
+    parser.add_argument("--nodes", type=int, default=2000, help="uzlový rozpočet na tah")
+    parser.add_argument("--random-opening", type=int, default=2, help="počet náhodných úvodních půltahů")
+    parser.add_argument("--search-plies", type=int, default=None,
+                        help="místo her prohledat všechny pozice do této hloubky")
+    args = parser.parse_args(argv)
+
+    if args.search_plies is not None:
+        builder = build_from_search(args.search_plies, args.nodes)
+    else:
+        builder = build_from_selfplay(args.games, args.plies, args.seed, args.workers,
+                                      {"node_limit": args.nodes, "time_limit": None},
+                                      args.random_opening)
+    builder.write(args.output)
+    print(f"Uloženo {len(builder.entries)} záznamů do {args.output}")
+
+
+if __name__ == "__main__":
+    main()
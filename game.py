@@ -1,109 +1,98 @@
-from piece import Piece
 from board import Board
-import pygame
+from heuristics import W_KING, count_material, opp
+from movegen import generate_moves, captures_available, is_jump, move_from, move_str
+from piece import PAWN
+from repetition import RepetitionTracker
+from tablebase import Tablebases
+from zobrist import position_key
+
+
+class DrawRules:
+    """
+    Pravidla ukončení hry navíc k Board.check_game_status (None = vypnuto):
+      repetitions      remíza, vyskytne-li se stejná pozice (i s hráčem na tahu) tolikrát
+      quiet_moves      remíza po tolika tazích každé strany bez braní a bez tahu pěšcem
+      material_margin  rozhodnutí pro stranu, která vede o tolik materiálu (pěšec 1,
+                       dáma W_KING), pokud hráč na tahu zrovna nebere
+      tablebase        rozhodnutí podle databáze koncovek (Tablebases nebo adresář)
+    """
+
+    def __init__(self, repetitions=3, quiet_moves=40, material_margin=None, tablebase=None):
+        self.repetitions = repetitions
+        self.quiet_moves = quiet_moves
+        self.material_margin = material_margin
+        self.tablebase = tablebase
+        self._opened = None     # cesta databáze, kterou pravidla sama otevřela (viz close)
+
+    def check(self, game):
+        """Stav hry podle těchto pravidel, nebo None (hra pokračuje)"""
+        color = game.current_player
+        if self.repetitions is not None and \
+                game.state_history.count(position_key(game.board, color)) >= self.repetitions:
+            return {"status": "game_over", "winner": None, "reason": "repetition"}
+        if self.quiet_moves is not None and game.quiet_plies >= 2 * self.quiet_moves:
+            return {"status": "game_over", "winner": None, "reason": "quiet_moves"}
+        if self.tablebase is not None:
+            if isinstance(self.tablebase, str):
+                self._opened = self.tablebase
+                self.tablebase = Tablebases(self.tablebase)
+            value = self.tablebase.probe(game.board, color)
+            if value is not None:
+                winner = None if value == 0 else (color if value > 0 else opp(color))
+                return {"status": "game_over", "winner": winner, "reason": "tablebase"}
+        if self.material_margin is not None:
+            my_pawns, my_kings, op_pawns, op_kings = count_material(game, "white")
+            balance = my_pawns + W_KING * my_kings - op_pawns - W_KING * op_kings
+            if abs(balance) >= self.material_margin and \
+                    not captures_available(generate_moves(game.board, color)):
+                winner = "white" if balance > 0 else "black"
+                return {"status": "game_over", "winner": winner, "reason": "material"}
+        return None
+
+    def close(self):
+        """Zavře databázi koncovek, pokud ji pravidla sama otevřela z cesty"""
+        if self._opened is not None:
+            self.tablebase.close()
+            self.tablebase, self._opened = self._opened, None
+
 
 class Game:
-    def __init__(self, player1, player2):
-        self.board = Board()
-        self.board.setup_pieces()  # Ujistěte se, že figurky jsou nastaveny
+    def __init__(self, player1, player2, board=None, rules=None):
+        # board může být libovolná deska s rozhraním Board (např. BitBoard)
+        if board is None:
+            board = Board()
+            board.setup_pieces()  # Ujistěte se, že figurky jsou nastaveny
+        self.board = board
         self.players = [player1, player2]
         self.current = 0  
         self.current_player = self.players[self.current].color
         self.messages = []  # Uchovává zprávy pro zobrazení
         self.running = True
-        self.state_history = []  # Pro detekci opakování pozic
+        # Klíče pozic i s hráčem na tahu (position_key) od výchozí pozice:
+        # opakování pro hledání i pro DrawRules
+        self.state_history = RepetitionTracker([position_key(board, self.current_player)])
+        self.chain = None       # (x, y) figurky uprostřed řetězce skoků (play_turn)
+        # Pravidla remízy a rozhodnutí (DrawRules); None = hraje se jen do konce podle desky
+        self.rules = rules
+        self.quiet_plies = 0        # půltahy od posledního braní nebo tahu pěšcem
+        self._status = None     # stav hry platný do dalšího tahu
         
     def run_game(self, visual_renderer):
-        pygame.init()
-        
-        clock = pygame.time.Clock()
-        
-        while self.running:
-            # Zobrazí aktuální stav hry
-            visual_renderer.draw_game_state(self)
+        """Hraje hru v okně (gui.py); pygame se načte až tady"""
+        from gui import GameWindow
+        GameWindow(self, visual_renderer).run()
 
-            # Zpracuje události a vstupy
-            self._process_events(visual_renderer)
-
-            # Zpracuje tahy AI, pokud je aktuální hráč AI
-            self._process_ai_turn(visual_renderer)
-
-            self._check_game_end(visual_renderer)
-
-            # Udržuje frekvenci snímků
-            clock.tick(60)
-        pygame.quit()
-        return
-    
-    def _check_game_end(self, visual_renderer):
-        game_status = self.board.check_game_status()
-        if game_status["status"] == "game_over":
-            visual_renderer.draw_game_state(self)
-            pygame.time.wait(1000)
-            visual_renderer.display_end(game_status["winner"])
-            self.running = False
-        return
-
-    def _process_events(self, visual_renderer):
-        """Zpracuje události pygame a uživatelské vstupy"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                # Zpracuje kliknutí pouze pro lidské hráče
-                if not self.current_player_obj().is_ai_player():
-                    self._handle_player_click(event.pos, visual_renderer)
-    
-    def _handle_player_click(self, pos, visual_renderer):
-        """Zpracuje kliknutí myší pro lidského hráče"""
-        tile = visual_renderer.get_tile_from_click(pos)
-        player = self.current_player_obj()
-        
-        if tile:
-            if player._selected is None:
-                player._selected = tile
-            else:
-                x1, y1 = player._selected
-                x2, y2 = tile
-                player.dalsi_tah = (x1, y1, x2, y2)
-                player._selected = None
-        else:
-            player._selected = None
-    
-    def _process_ai_turn(self, visual_renderer):
-        """Zpracuje tah AI hráče"""
-        player = self.current_player_obj()
-        
-    # Přeskočí, pokud není AI nebo pokud lidský hráč má čekající tah
-        if not player.is_ai_player():
-            move = player.get_move(self)
-            if move:
-                try:
-                    self.play_turn(*move)
-                except ValueError as e:
-                    self.add_message(f"Chyba: {str(e)}")
-            return
-        
-    # Zpracuje tah AI
-        move = player.get_move(self)
-        if move:
-            x1, y1, x2, y2 = move
-            
-            # Ukáže zprávu o přemýšlení
-            self.add_message(f"AI zvažuje tah {x1},{y1} -> {x2},{y2}")
-            visual_renderer.draw_game_state(self)
-            
-            # Přidá zpoždění pro zobrazení AI "přemýšlení"
-            pygame.time.wait(1000)
-            
-            try:
-                self.play_turn(x1, y1, x2, y2)
-                self.add_message(f"AI táhl {x1},{y1} -> {x2},{y2}")
-            except ValueError as e:
-                self.add_message(f"Chyba: {e}")
-            
-            # Aktualizuje zobrazení po tahu
-            visual_renderer.draw_game_state(self)
+    def game_status(self):
+        """
+        Stav hry (check_game_status a pravidla remízy), přepočítá se jen po tahu.
+        Při remíze je winner None.
+        """
+        if self._status is None:
+            status = self.board.check_game_status()
+            if status["status"] != "game_over" and self.rules is not None:
+                status = self.rules.check(self) or status
+            self._status = status
+        return self._status
 
     def add_message(self, msg):
         """Přidá zprávu do fronty pro zobrazení"""
@@ -117,13 +106,32 @@ class Game:
     def current_color(self):
         return self.current_player
             
+    def play_move(self, move):
+        """
+        Zahraje celý tah z generate_moves (i řetězec skoků) najednou
+        a předá tah soupeři. Nelegální tah vyvolá ValueError.
+        """
+        if self.chain is not None:
+            raise ValueError("Nejdřív dokončete rozehraný řetězec skoků.")
+        if move not in generate_moves(self.board, self.current_player):
+            raise ValueError(f"Neplatný tah {move_str(move)}.")
+        _, piece, _ = self.board.make_move(move)
+        self._end_turn(is_jump(move) or piece.type_code == PAWN)
+
     def play_turn(self, x1, y1, x2, y2):
+        """
+        Jeden krok nebo skok (např. kliknutí člověka). Může-li figurka po
+        skoku skákat dál, zůstává hráč na tahu a řetězec musí dokončit
+        stejnou figurkou; proměna v dámu řetězec ukončí.
+        """
         y1, y2 = y1 % 8, y2 % 8
         figurka = self.board.pole[x1][y1]
         if figurka == 0:
             raise ValueError("Na výchozím poli není žádná figurka.")
         if figurka.color != self.current_player:
             raise ValueError("Nelze hrát s figurkou soupeře.")
+        if self.chain is not None and (x1, y1) != self.chain:
+            raise ValueError("Řetězec skoků musí pokračovat stejnou figurkou.")
         dx = x2 - x1
         dy = (y2 - y1) % 8
         if abs(dx) == 2 and dy in [2, 6]:
@@ -136,61 +144,60 @@ class Game:
             if figurka.type == "pawn":
                 if (figurka.color == "white" and dx != 1) or (figurka.color == "black" and dx != -1):
                     raise ValueError("Pěšec nemůže jít zpět.")
-            self.board.pole[x2][y2] = figurka
-            self.board.pole[x1][y1] = 0
+            self.board.set_piece(x2, y2, figurka)
+            self.board.set_piece(x1, y1, 0)
         else:
             raise ValueError("Neplatný tah.")
         # Proměna v dámu
+        promoted = False
         if figurka.type == "pawn":
             if (figurka.color == "white" and x2 == 7) or (figurka.color == "black" and x2 == 0):
-                self.board.pole[x2][y2] = Piece(figurka.color, "queen")
-        # Ulož aktuální stav desky do historie (jako hash nebo string)
-        if hasattr(self, 'state_history'):
-            self.state_history.append(self._board_state_hash())
+                self.board.set_piece(x2, y2, figurka.promoted())
+                promoted = True
+        # Může-li figurka skákat dál, tah pokračuje
+        if abs(dx) == 2 and not promoted and self._can_continue(x2, y2):
+            self.chain = (x2, y2)
+            self._status = None
+            return
+        self.chain = None
+        self._end_turn(abs(dx) == 2 or figurka.type == "pawn")
+
+    def _can_continue(self, x, y):
+        """Může figurka na [x][y] hned znovu skočit?"""
+        moves = generate_moves(self.board, self.current_player)
+        return captures_available(moves) and any(move_from(m) == x * 8 + y for m in moves)
+
+    def _end_turn(self, irreversible):
+        """
+        Uloží pozici do historie a předá tah soupeři. irreversible: tah
+        bral nebo táhl pěšcem (nuluje počítadlo pro quiet_moves).
+        """
+        self.quiet_plies = 0 if irreversible else self.quiet_plies + 1
         # Změna hráče
         self.current = 1 - self.current
         self.current_player = self.players[self.current].color
+        self.state_history.push(self._board_state_hash())
+        self._status = None
+
+    def snapshot(self):
+        """Kopie hry s vlastní deskou a historií (pro hledání mimo hlavní vlákno)"""
+        copy = Game(self.players[0], self.players[1], board=self.board.copy(), rules=self.rules)
+        copy.current = self.current
+        copy.current_player = self.current_player
+        copy.chain = self.chain
+        copy.quiet_plies = self.quiet_plies
+        copy.state_history = RepetitionTracker(self.state_history)
+        return copy
 
     def _board_state_hash(self):
-        # Jednoduchý hash: tuple všech typů a barev na desce
-        return tuple(tuple((p.type, p.color) if p != 0 else 0 for p in row) for row in self.board.pole)
+        # Zobrist klíč pozice i s hráčem na tahu, jak se ukládá do state_history
+        return position_key(self.board, self.current_player)
             
     def moznostSkoku(self, color):
-        figurky_bile, figurky_cerne = self.vsechny_figurky()
-        figurky = figurky_bile if color == "white" else figurky_cerne
-
-        for x, y in figurky:
-            piece = self.board.pole[x][y]
-            for dx, dy in piece.skok(): #pro každý skok
-                x2, y2 = x + dx, (y + dy) % 8
-                if not self.board.je_v_poli(x2, y2):
-                    continue
-                try:
-                    # zkusí jestli by slo skakat
-                    jumped_x = (x + x2) // 2
-                    jumped_y = self.board.middle_col(y, y2)
-                    preskocena = self.board.pole[jumped_x][jumped_y]
-                    if self.board.je_volne(x2, y2) and preskocena != 0 and preskocena.color != color:
-                        if piece.type == "pawn":
-                            if (piece.color == "white" and dx < 0) or (piece.color == "black" and dx > 0):
-                                continue
-                        return True
-                except IndexError:
-                    continue
-        return False        
-            
+        return captures_available(generate_moves(self.board, color))
+
     def vsechny_figurky(self):
-        figurkyBile = []
-        figurkyCerne = []
-        for i in range(8):
-            for j in range(8):
-                piece = self.board.pole[i][j]
-                if piece != 0:
-                    if piece.color == "white":
-                        figurkyBile.append((i, j))
-                    elif piece.color == "black":
-                        figurkyCerne.append((i, j))
-        return figurkyBile, figurkyCerne         
+        return self.board.vsechny_figurky()
         
         
     def display_board(self):
@@ -208,7 +215,9 @@ class Game:
             player = self.players[self.current]
             try:
                 move = player.get_move(self)
-                if move:
+                if isinstance(move, int):
+                    self.play_move(move)        # tah AI (celé číslo z movegen)
+                elif move:
                     self.play_turn(*move)
             except Exception as e:
                 print("Chyba:", e)
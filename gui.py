@@ -0,0 +1,156 @@
+# gui.py
+# Okno hry: smyčka pygame nad Game a VisualRenderer.
+# Pravidla a AI (game, board, player, ...) pygame neimportují, takže
+# testy, dávkové hraní a pracovní procesy nenačítají SDL; načte se až zde.
+
+import pygame
+
+from movegen import move_str
+from worker import AIWorker
+
+
+class GameWindow:
+    """
+    Smyčka okna pro jednu hru: překresluje změny, zpracuje kliknutí
+    lidského hráče a tahy AI hledané na pozadí (AIWorker).
+    """
+
+    def __init__(self, game, visual_renderer):
+        self.game = game
+        self.renderer = visual_renderer
+        self._workers = {}      # barva -> AIWorker (hledání AI na pozadí)
+        # Co je potřeba překreslit ("board", "messages"); prázdné = nic
+        self.dirty = {"board", "messages"}
+        self.ai_info = None     # poslední hlášení hledání AI (tah, skóre, hloubka, uzly)
+        self._seen = None       # stav hry při posledním vykreslení (viz _collect_changes)
+
+    def run(self):
+        pygame.init()
+
+        clock = pygame.time.Clock()
+
+        while self.game.running:
+            # Překreslí jen to, co se od minula změnilo
+            self._redraw()
+
+            # Zpracuje události a vstupy
+            self._process_events()
+
+            # Zpracuje tahy AI, pokud je aktuální hráč AI
+            self._process_ai_turn()
+
+            self._check_game_end()
+
+            # Udržuje frekvenci snímků
+            clock.tick(60)
+        for worker in self._workers.values():
+            worker.cancel()
+        # Hráči AI uvolní procesy, knihovnu a databázi
+        for player in self.game.players:
+            if player.is_ai_player():
+                player.close()
+        pygame.quit()
+
+    def _collect_changes(self):
+        """Porovná hru s posledním vykreslením a doplní, co se změnilo"""
+        game = self.game
+        board = (game.board.key, game.current, game.chain)
+        messages = tuple(game.messages)
+        if self._seen is None or self._seen[0] != board:
+            self.dirty |= {"board", "messages"}
+        elif self._seen[1] != messages:
+            self.dirty.add("messages")
+        self._seen = (board, messages)
+
+    def _redraw(self):
+        self._collect_changes()
+        if self.dirty:
+            self.renderer.draw_game_state(self.game, self.dirty, self.ai_info)
+            self.dirty = set()
+
+    def _check_game_end(self):
+        game_status = self.game.game_status()
+        if game_status["status"] == "game_over":
+            self._redraw()
+            pygame.time.wait(1000)
+            self.renderer.display_end(game_status["winner"])
+            self.game.running = False
+
+    def _process_events(self):
+        """Zpracuje události pygame a uživatelské vstupy"""
+        game = self.game
+        events = pygame.event.get()
+        player = game.current_player_obj()
+        if not events and not self.dirty and not player.is_ai_player() \
+                and getattr(player, "dalsi_tah", None) is None:
+            # Na tahu je člověk a nic se neděje - spí, dokud nepřijde událost
+            events = [pygame.event.wait()]
+        for event in events:
+            if event.type == pygame.QUIT:
+                game.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Zpracuje kliknutí pouze pro lidské hráče
+                if not game.current_player_obj().is_ai_player():
+                    self._handle_player_click(event.pos)
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.dirty |= {"board", "messages"}
+
+    def _handle_player_click(self, pos):
+        """Zpracuje kliknutí myší pro lidského hráče"""
+        tile = self.renderer.get_tile_from_click(pos)
+        player = self.game.current_player_obj()
+
+        if tile:
+            if player._selected is None:
+                player._selected = tile
+            else:
+                x1, y1 = player._selected
+                x2, y2 = tile
+                player.dalsi_tah = (x1, y1, x2, y2)
+                player._selected = None
+        else:
+            player._selected = None
+        self.dirty.add("board")
+
+    def _process_ai_turn(self):
+        """Zpracuje tah AI hráče"""
+        game = self.game
+        player = game.current_player_obj()
+
+        # Přeskočí, pokud není AI nebo pokud lidský hráč má čekající tah
+        if not player.is_ai_player():
+            move = player.get_move(game)
+            if move:
+                try:
+                    game.play_turn(*move)
+                except ValueError as e:
+                    game.add_message(f"Chyba: {str(e)}")
+            return
+
+        # Zpracuje tah AI - hledá se na pozadí, tady se jen neblokujícím dotazem
+        # vyzvedne výsledek, takže okno dál reaguje a překresluje se
+        worker = self._workers.get(player.color)
+        if worker is None:
+            worker = self._workers[player.color] = AIWorker(player)
+        if worker.pondering:
+            worker.cancel()     # soupeř už táhl; výsledek přemýšlení si drží hráč
+        move = worker.poll()
+        if move is None:
+            if not worker.busy:
+                worker.start(game)
+                game.add_message("AI přemýšlí...")
+            elif worker.progress != self.ai_info:
+                self.ai_info = worker.progress
+                self.dirty.add("messages")
+            return
+
+        self.ai_info = None
+        try:
+            game.play_move(move)
+            game.add_message(f"AI táhl {move_str(move)}")
+        except ValueError as e:
+            game.add_message(f"Chyba: {e}")
+            return
+        # Proti člověku přemýšlí AI i v jeho čase
+        if getattr(player, "use_ponder", False) and not game.current_player_obj().is_ai_player():
+            worker.start(game, ponder=True)
@@ -4,6 +4,10 @@
 
 from typing import List, Tuple
 
+from movegen import generate_moves, captures_available, first_hop
+from piece import BLACK, PAWN, QUEEN, WHITE
+from tables import JUMP_SQUARES, NEIGHBOURS, NEIGHBOUR_SQUARES, OVER, STEP_SQUARES, ZONE
+
 # Nastavení vah
 W_KING      = 2.8     # 1) dáma zhruba ~2.5–3× silnější než pěšec
 W_MOB       = 0.08    # 2) mobilita (počet legálních tahů)
@@ -18,52 +22,78 @@ CENTER_ROWS = range(2, 6)
 CENTER_COLS = range(2, 6)  
 
 
-def evaluate_position(game, me_color: str):
+def evaluate_position(game, me_color: str, stats=None):
     """
     Vrátí reálné skóre pozice z pohledu 'me_color'.
     Kladné = lepší pro mě, záporné = horší.
     Zohledňuje body 1-5 (viz výše).
+    Se stats (SearchStats) se měří čas jednotlivých složek.
     """
+    if stats is not None:
+        stats.start_laps()
 
     #  MATERIÁL
     my_pawns, my_kings, op_pawns, op_kings = count_material(game, me_color)
     material = (my_pawns + W_KING * my_kings) - (op_pawns + W_KING * op_kings)
+    if stats is not None:
+        stats.lap("material")
+
+    # Tahy obou stran stačí vygenerovat jednou pro mobilitu, braní i hrozby
+    my_moves = generate_moves(game.board, me_color)
+    op_moves = generate_moves(game.board, opp(me_color))
+    if stats is not None:
+        stats.movegen_calls += 2
+        stats.lap("movegen")
 
     #  MOBILITA
-    my_moves = count_legal_moves(game, me_color)
-    op_moves = count_legal_moves(game, opp(me_color))
-    mobility = W_MOB * (my_moves - op_moves)
+    mobility = W_MOB * (count_first_hops(my_moves) - count_first_hops(op_moves))
 
     # POVINNÉ BRANÍ & HROZBY
     # Povinné braní – mít capture je „dobře“ (tempo i změna materiálu)
-    my_can_capture = 1 if game.moznostSkoku(me_color) else 0
-    op_can_capture = 1 if game.moznostSkoku(opp(me_color)) else 0
+    my_can_capture = 1 if captures_available(my_moves) else 0
+    op_can_capture = 1 if captures_available(op_moves) else 0
     capture_pressure = W_CAPTURE * (my_can_capture - op_can_capture)
 
     # Kolik mých kamenů je přímo k sebrání jedním skokem soupeře?
-    my_threatened = count_threatened_pieces(game, me_color)
+    my_threatened = len(captured_squares(op_moves))
     threats_penalty = - W_THREAT * my_threatened
+    if stats is not None:
+        stats.lap("mobility_threats")
 
     # TLAK NA PROMĚNU
     # Jednoduché: čím blíž poslední řadě, tím větší bonus (jen pěšci)
     promo = W_PROMO * (promotion_progress(game, me_color) -
                        promotion_progress(game, opp(me_color)))
+    if stats is not None:
+        stats.lap("promotion")
 
     # CENTRUM & FORMAce
     center_score = W_CENTER * (count_in_center(game, me_color) -
                                count_in_center(game, opp(me_color)))
+    if stats is not None:
+        stats.lap("center")
     formation_score = W_FORMATION * (formation_pairs(game, me_color) -
                                      formation_pairs(game, opp(me_color)))
+    if stats is not None:
+        stats.lap("formation")
+
+    repetition = repetition_penalty(game)
+    if stats is not None:
+        stats.lap("repetition")
+
+    return material + mobility + capture_pressure + threats_penalty + promo + center_score + formation_score + repetition
 
-    # Penalizace za opakování pozice (cyklení)
-    repetition_penalty = 0
-    if hasattr(game, 'state_history'):
-        # Pokud se aktuální pozice vyskytla už 2x nebo víc, penalizuj
-        current_hash = game._board_state_hash()
-        repeats = game.state_history.count(current_hash)
+
+def repetition_penalty(game) -> float:
+    """Penalizace za opakování pozice (cyklení)"""
+    history = game.state_history
+    if history:
+        # Aktuální pozice je poslední v historii (i během hledání);
+        # pokud se vyskytla už 2x nebo víc, penalizuj
+        repeats = history.count(history[-1])
         if repeats >= 2:
-            repetition_penalty = -2.0 * repeats  # váhu můžeš upravit
-    return material + mobility + capture_pressure + threats_penalty + promo + center_score + formation_score + repetition_penalty
+            return -2.0 * repeats  # váhu můžeš upravit
+    return 0
 
 
 #  Pomocné funkce
@@ -83,7 +113,7 @@ def count_material(game, me_color: str):
         pawns = kings = 0
         for x, y in iterate_pieces(game, color):
             p = game.board.pole[x][y]
-            if p.type == "queen":
+            if p.type_code == QUEEN:
                 kings += 1
             else:
                 pawns += 1
@@ -98,39 +128,19 @@ def count_legal_moves(game, color: str) -> int:
     """
     Vrátí počet legálních tahů pro danou barvu. Respektuje povinné braní:
     pokud existuje skok, vrátí jen počet skoků.
-    (Bez simulace - jen lokální kontrola podle desky.)
     """
-    board = game.board
-    my_figs = iterate_pieces(game, color)
-
-    jumps = 0
-    steps = 0
-
-    for x, y in my_figs:
-        piece = board.pole[x][y]
-        # Skoky
-        for dx, dy in piece.skok():
-            x2, y2 = x + dx, (y + dy) % 8
-            if not board.je_v_poli(x2, y2) or not board.je_volne(x2, y2):
-                continue
-            mx, my = (x + x2) // 2, board.middle_col(y, y2)
-            victim = board.pole[mx][my]
-            if victim != 0 and victim.color != color:
-                # pěšec skáče správným směrem (dáma oběma)
-                if piece.type == "queen" or \
-                   (color == "white" and dx > 0) or (color == "black" and dx < 0):
-                    jumps += 1
-        # Kroky
-        for dx, dy in piece.krok():
-            x2, y2 = x + dx, (y + dy) % 8
-            if not board.je_v_poli(x2, y2) or not board.je_volne(x2, y2):
-                continue
-            # pěšec jen dopředu, dáma i zpět
-            if piece.type == "queen" or \
-               (color == "white" and dx == 1) or (color == "black" and dx == -1):
-                steps += 1
+    return len(generate_moves(game.board, color))
+
 
-    return jumps if jumps > 0 else steps
+def count_first_hops(moves) -> int:
+    """
+    Počet různých prvních kroků/skoků v seznamu tahů. Řetězce skoků se
+    stejným začátkem se počítají jednou, takže mobilita zůstává počtem
+    možností na jeden skok (stejně jako v IncrementalEvaluator).
+    """
+    if not captures_available(moves):
+        return len(moves)
+    return len({first_hop(move) for move in moves})
 
 
 def count_threatened_pieces(game, my_color: str) -> int:
@@ -138,27 +148,14 @@ def count_threatened_pieces(game, my_color: str) -> int:
     Spočítá, kolik mých kamenů může soupeř sebrat JEDNÍM skokem z aktuální pozice.
     (Hrubý, ale rychlý odhad taktického rizika.)
     """
-    board = game.board
-    opp_color = opp(my_color)
-    opp_figs = iterate_pieces(game, opp_color)
+    return len(captured_squares(generate_moves(game.board, opp(my_color))))
 
-    threatened_positions = set()
 
-    for ox, oy in opp_figs:
-        op = board.pole[ox][oy]
-        for dx, dy in op.skok():
-            tx, ty = ox + dx, (oy + dy) % 8
-            if not board.je_v_poli(tx, ty) or not board.je_volne(tx, ty):
-                continue
-            mx, my = (ox + tx) // 2, board.middle_col(oy, ty)
-            mid = board.pole[mx][my]
-            if mid != 0 and mid.color == my_color:
-                # pěšec soupeře musí skákat správným směrem
-                if op.type == "queen" or \
-                   (opp_color == "white" and dx > 0) or (opp_color == "black" and dx < 0):
-                    threatened_positions.add((mx, my))
-
-    return len(threatened_positions)
+def captured_squares(moves):
+    """Množina polí přeskočených prvním skokem tahů ze seznamu"""
+    if not captures_available(moves):
+        return set()
+    return {OVER[first_hop(move)] for move in moves}
 
 
 def promotion_progress(game, color: str) -> float:
@@ -171,7 +168,7 @@ def promotion_progress(game, color: str) -> float:
     count = 0
     for x, y in iterate_pieces(game, color):
         p = game.board.pole[x][y]
-        if p.type == "pawn":
+        if p.type_code == PAWN:
             if color == "white":
                 # 0..7 -> 0..1
                 total += x / 7.0
@@ -195,13 +192,180 @@ def formation_pairs(game, color: str) -> int:
     Hrubé měřítko souhry: kolik mám diagonálně sousedících dvojic (±1,±1).
     (Válcový sloupec řešíme mod 8.)
     """
-    board = game.board
     my_set = set(iterate_pieces(game, color))
     pairs = 0
     for x, y in my_set:
-        for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
-            nx, ny = x + dx, (y + dy) % 8
-            if board.je_v_poli(nx, ny) and (nx, ny) in my_set:
+        for n in NEIGHBOURS[x * 8 + y]:
+            if n in my_set:
                 pairs += 1
     # Každý pár se započítá 2× (z obou konců)
     return pairs // 2
+
+
+#  Inkrementální hodnocení
+
+# Složky záznamu jedné figurky (a průběžných součtů pro každou barvu)
+PAWNS, KINGS, PROMO, CENTER, NEIGH, JUMPS_, STEPS_, THREAT = range(8)
+
+
+class IncrementalEvaluator:
+    """
+    Udržuje průběžné součty složek evaluate_position pro obě barvy.
+    Každá figurka má záznam (materiál, pokrok k proměně v sedminách, centrum,
+    sousedé, skoky, kroky, ohrožení), který závisí jen na polích v ZONE.
+    Po tahu se volá update() se změněnými poli a přepočítají se jen
+    záznamy v jejich okolí; undo() vrátí součty do stavu před tahem.
+    Připojené k desce (board.evaluator) ho volají Board.make_move a unmake_move.
+    Repetice se nezapočítává (je to vlastnost historie, ne desky).
+    """
+
+    def __init__(self, board):
+        self.board = board
+        if board.bitboard:
+            self._record = self._record_squares
+        self.reset()
+
+    def reset(self):
+        """Úplný přepočet všech záznamů a součtů"""
+        self.records = [None] * 64
+        self.totals = ([0] * 8, [0] * 8)     # indexováno kódem barvy
+        self._undo = []
+        for sq in range(64):
+            rec = self._record(sq)
+            if rec is not None:
+                self.records[sq] = rec
+                self._add(rec, 1)
+
+    def _add(self, rec, sign):
+        total = self.totals[rec[0]]
+        for i in range(8):
+            total[i] += sign * rec[i + 1]
+
+    def _record(self, sq):
+        pole = self.board.pole
+        x, y = divmod(sq, 8)
+        piece = pole[x][y]
+        if not piece:
+            return None
+        side = piece.color_code
+        pawn = piece.type_code == PAWN
+        promo = (x if side == WHITE else 7 - x) if pawn else 0
+        center = 1 if x in CENTER_ROWS and y in CENTER_COLS else 0
+
+        neigh = threat = 0
+        for nx, ny in NEIGHBOURS[sq]:
+            other = pole[nx][ny]
+            if not other:
+                continue
+            if other.color_code == side:
+                neigh += 1
+            elif not threat:
+                # Může soused přeskočit tuto figurku?
+                for mx, my, tx, ty in other.jumps[nx * 8 + ny]:
+                    if mx == x and my == y and not pole[tx][ty]:
+                        threat = 1
+
+        jumps = steps = 0
+        for mx, my, x2, y2 in piece.jumps[sq]:
+            victim = pole[mx][my]
+            if victim and victim.color_code != side and not pole[x2][y2]:
+                jumps += 1
+        for x2, y2 in piece.steps[sq]:
+            if not pole[x2][y2]:
+                steps += 1
+
+        return (side, 1 if pawn else 0, 0 if pawn else 1, promo, center, neigh, jumps, steps, threat)
+
+    def _record_squares(self, sq):
+        """_record pro BitBoard: čte seznam board.squares místo board.pole"""
+        squares = self.board.squares
+        piece = squares[sq]
+        if not piece:
+            return None
+        x, y = divmod(sq, 8)
+        side = piece.color_code
+        pawn = piece.type_code == PAWN
+        promo = (x if side == WHITE else 7 - x) if pawn else 0
+        center = 1 if x in CENTER_ROWS and y in CENTER_COLS else 0
+
+        neigh = threat = 0
+        for n in NEIGHBOUR_SQUARES[sq]:
+            other = squares[n]
+            if not other:
+                continue
+            if other.color_code == side:
+                neigh += 1
+            elif not threat:
+                for over, target in JUMP_SQUARES[other.code][n]:
+                    if over == sq and not squares[target]:
+                        threat = 1
+
+        jumps = steps = 0
+        for over, target in JUMP_SQUARES[piece.code][sq]:
+            victim = squares[over]
+            if victim and victim.color_code != side and not squares[target]:
+                jumps += 1
+        for target in STEP_SQUARES[piece.code][sq]:
+            if not squares[target]:
+                steps += 1
+
+        return (side, 1 if pawn else 0, 0 if pawn else 1, promo, center, neigh, jumps, steps, threat)
+
+    def update(self, squares):
+        """Přepočítá záznamy po změně daných polí (indexy x * 8 + y)"""
+        affected = set()
+        for sq in squares:
+            affected.update(ZONE[sq])
+        records = self.records
+        saved = []
+        for sq in affected:
+            old = records[sq]
+            new = self._record(sq)
+            if old == new:
+                continue
+            saved.append((sq, old))
+            if old is not None:
+                self._add(old, -1)
+            if new is not None:
+                self._add(new, 1)
+            records[sq] = new
+        self._undo.append(saved)
+
+    def undo(self):
+        """Vrátí poslední update()"""
+        records = self.records
+        for sq, old in self._undo.pop():
+            new = records[sq]
+            if new is not None:
+                self._add(new, -1)
+            if old is not None:
+                self._add(old, 1)
+            records[sq] = old
+
+    def has_moves(self, side: int) -> bool:
+        """Má strana (kód barvy) nějaký tah? Ze součtů skoků a kroků, bez generování tahů"""
+        total = self.totals[side]
+        return total[JUMPS_] > 0 or total[STEPS_] > 0
+
+    def score(self, me_color: str) -> float:
+        """Skóre stejné jako evaluate_position bez penalizace za repetici"""
+        side = WHITE if me_color == "white" else BLACK
+        me, op = self.totals[side], self.totals[1 - side]
+        material = (me[PAWNS] + W_KING * me[KINGS]) - (op[PAWNS] + W_KING * op[KINGS])
+        my_moves = me[JUMPS_] if me[JUMPS_] > 0 else me[STEPS_]
+        op_moves = op[JUMPS_] if op[JUMPS_] > 0 else op[STEPS_]
+        mobility = W_MOB * (my_moves - op_moves)
+        capture_pressure = W_CAPTURE * ((me[JUMPS_] > 0) - (op[JUMPS_] > 0))
+        threats_penalty = - W_THREAT * me[THREAT]
+        promo = W_PROMO * (me[PROMO] - op[PROMO]) / 7.0
+        center_score = W_CENTER * (me[CENTER] - op[CENTER])
+        formation_score = W_FORMATION * (me[NEIGH] // 2 - op[NEIGH] // 2)
+        return material + mobility + capture_pressure + threats_penalty + promo + center_score + formation_score
+
+    def check(self, game, me_color: str):
+        """Ladicí kontrola: porovná průběžné skóre s úplným přepočtem"""
+        expected = evaluate_position(game, me_color) - repetition_penalty(game)
+        actual = self.score(me_color)
+        if abs(expected - actual) > 1e-9:
+            raise AssertionError(
+                f"Inkrementální hodnocení {actual} nesouhlasí s přepočtem {expected}.")
@@ -1,26 +1,28 @@
 from player import HumanPlayer, AIPlayer
 from visual import start_menu, VisualRenderer
-from game import Game
+from game import DrawRules, Game
+from gui import GameWindow
 
 
 def main():
     mode = start_menu()
+    rules = None
     if mode == 1:
         p1 = HumanPlayer("white")
         p2 = HumanPlayer("black")
     elif mode == 2:
         p1 = HumanPlayer("white")
-        p2 = AIPlayer("black")
+        p2 = AIPlayer("black", ponder=True)
     elif mode == 3:
         p1 = AIPlayer("white")
         p2 = AIPlayer("black")
+        rules = DrawRules()     # AI proti AI by se mohla přetahovat donekonečna
     else:
         print("Neplatná volba nebo ukončeno.")
         return
     
-    game = Game(p1, p2)
-    renderer = VisualRenderer()
-    game.run_game(renderer)
+    game = Game(p1, p2, rules=rules)
+    GameWindow(game, VisualRenderer()).run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+# movegen.py
+# Jediný generátor legálních tahů, sdílený pravidly (Game, Board), AI i heuristikami.
+#
+# Tah je jedno celé číslo (indexy polí sq = x * 8 + y):
+#   bity 0-5      výchozí pole
+#   bity 6-9      počet dopadů n (krok 1, skok 1 až 12)
+#   bity 10..     dopadová pole, 6 bitů na každé (v pořadí tahu)
+#   bity 100..    maska přeskočených (sebraných) polí, 64 bitů
+# Skok je celý řetězec skoků jednou figurkou; skok poznáme podle nenulové masky.
+# Prostý krok se vejde do 16 bitů, takže seznamy tahů nealokují n-tice.
+
+from piece import PAWN, PIECES, WHITE, BLACK
+from tables import JUMP_SQUARES, OVER, STEP_SQUARES
+
+COUNT_SHIFT = 6
+LANDING_SHIFT = 10
+CAPTURE_SHIFT = 100
+MOVE_BYTES = 21             # pevná délka tahu v bajtech (knihovna zahájení)
+
+_LAST_ROW = (7, 0)          # indexováno kódem barvy: kde se pěšec promění
+
+# Předpočítané kroky jako (x2, y2, tah) pro [kód figurky][pole]
+_STEPS = tuple(
+    tuple(tuple((x2, y2, sq | 1 << COUNT_SHIFT | (x2 * 8 + y2) << LANDING_SHIFT)
+                for x2, y2 in piece.steps[sq])
+          for sq in range(64))
+    for piece in PIECES)
+# Totéž pro desky z masek (BitBoard) jako (cílové pole, tah)
+_STEP_MOVES = tuple(
+    tuple(tuple((target, sq | 1 << COUNT_SHIFT | target << LANDING_SHIFT)
+                for target in STEP_SQUARES[code][sq])
+          for sq in range(64))
+    for code in range(4))
+
+
+def generate_moves(board, color):
+    """
+    Vrátí všechny legální tahy dané barvy jedním průchodem figurkami.
+    Platí povinné braní: existuje-li skok, vrací se jen skoky, a to celé
+    řetězce - figurka skáče, dokud může; pěšec, který doskočí na poslední
+    řadu, se promění a řetězec končí.
+    """
+    if board.bitboard:
+        return _generate_from_masks(board, color)
+    pole = board.pole
+    whites, blacks = board.vsechny_figurky()
+    side = WHITE if color == "white" else BLACK
+    jumps, steps = [], []
+    for x, y in (whites if side == WHITE else blacks):
+        piece = pole[x][y]
+        sq = x * 8 + y
+        # Prázdné pole je 0 (nepravdivé), figurka je vždy pravdivá
+        for mx, my, x2, y2 in piece.jumps[sq]:
+            victim = pole[mx][my]
+            if victim and victim.color_code != side and not pole[x2][y2]:
+                _chains(pole, piece, side, sq, x2, y2, 1, (x2 * 8 + y2) << LANDING_SHIFT,
+                        1 << (mx * 8 + my), jumps)
+        if not jumps:
+            # Kroky sbíráme jen dokud není nalezen žádný skok
+            for x2, y2, move in _STEPS[piece.code][sq]:
+                if not pole[x2][y2]:
+                    steps.append(move)
+    return jumps or steps
+
+
+def _chains(pole, piece, side, origin, x, y, count, landings, captured, out):
+    """
+    Prodlouží řetězec skoků figurky piece (z pole origin, teď na [x][y])
+    a do out přidá všechny jeho nejdelší pokračování. Přeskočené figurky
+    jsou už sebrané (jejich pole je volné), výchozí pole je také volné.
+    """
+    if piece.type_code != PAWN or x != _LAST_ROW[side]:
+        extended = False
+        for mx, my, x2, y2 in piece.jumps[x * 8 + y]:
+            over = mx * 8 + my
+            if captured >> over & 1:
+                continue
+            victim = pole[mx][my]
+            if not victim or victim.color_code == side:
+                continue
+            target = x2 * 8 + y2
+            if pole[x2][y2] and target != origin and not captured >> target & 1:
+                continue
+            extended = True
+            _chains(pole, piece, side, origin, x2, y2, count + 1,
+                    landings | target << (LANDING_SHIFT + 6 * count), captured | 1 << over, out)
+        if extended:
+            return
+    out.append(origin | count << COUNT_SHIFT | landings | captured << CAPTURE_SHIFT)
+
+
+def _generate_from_masks(board, color):
+    """generate_moves pro BitBoard: obsazenost se čte z masek, ne z board.pole"""
+    side = WHITE if color == "white" else BLACK
+    own, enemy = (board.white, board.black) if side == WHITE else (board.black, board.white)
+    occupied = own | enemy
+    queens = board.queens
+    jumps, steps = [], []
+    rest = own
+    while rest:
+        low = rest & -rest
+        rest ^= low
+        sq = low.bit_length() - 1
+        code = 2 * side + (1 if queens & low else 0)
+        for over, target in JUMP_SQUARES[code][sq]:
+            if enemy >> over & 1 and not occupied >> target & 1:
+                _mask_chains(code, side, enemy ^ 1 << over, occupied ^ low ^ 1 << over, sq, target,
+                             1, target << LANDING_SHIFT, 1 << over, jumps)
+        if not jumps:
+            for target, move in _STEP_MOVES[code][sq]:
+                if not occupied >> target & 1:
+                    steps.append(move)
+    return jumps or steps
+
+
+def _mask_chains(code, side, enemy, occupied, origin, sq, count, landings, captured, out):
+    """
+    _chains pro masky: enemy a occupied už nemají sebrané figurky
+    ani výchozí pole, takže stačí testovat bity.
+    """
+    if code & 1 != PAWN or sq >> 3 != _LAST_ROW[side]:
+        extended = False
+        for over, target in JUMP_SQUARES[code][sq]:
+            if enemy >> over & 1 and not occupied >> target & 1:
+                extended = True
+                bit = 1 << over
+                _mask_chains(code, side, enemy ^ bit, occupied ^ bit, origin, target, count + 1,
+                             landings | target << (LANDING_SHIFT + 6 * count), captured | bit, out)
+        if extended:
+            return
+    out.append(origin | count << COUNT_SHIFT | landings | captured << CAPTURE_SHIFT)
+
+
+def encode_move(frm, landings, captured=0):
+    """Tah z výchozího pole, seznamu dopadových polí a masky přeskočených polí"""
+    move = frm | len(landings) << COUNT_SHIFT | captured << CAPTURE_SHIFT
+    for i, sq in enumerate(landings):
+        move |= sq << (LANDING_SHIFT + 6 * i)
+    return move
+
+
+def move_from(move):
+    """Výchozí pole tahu (x * 8 + y)"""
+    return move & 63
+
+
+def move_to(move):
+    """Cílové pole tahu (poslední dopad)"""
+    count = move >> COUNT_SHIFT & 15
+    return move >> (LANDING_SHIFT - 6 + 6 * count) & 63
+
+
+def move_landings(move):
+    """Seznam dopadových polí v pořadí tahu"""
+    count = move >> COUNT_SHIFT & 15
+    return [move >> (LANDING_SHIFT + 6 * i) & 63 for i in range(count)]
+
+
+def move_captured(move):
+    """Maska přeskočených polí (bit x * 8 + y), u kroku 0"""
+    return move >> CAPTURE_SHIFT
+
+
+def first_hop(move):
+    """První krok nebo skok tahu jako (z pole, na pole)"""
+    return move & 63, move >> LANDING_SHIFT & 63
+
+
+def move_path(move):
+    """Pole tahu jako souřadnice [(x1, y1), (x2, y2), ...]"""
+    return [divmod(sq, 8) for sq in [move & 63] + move_landings(move)]
+
+
+def move_from_path(path):
+    """
+    Tah ze souřadnic [(x1, y1), (x2, y2), ...]; přeskočená pole se
+    dopočítají. Nekontroluje legalitu, jen tvar (krok nebo řetězec skoků).
+    """
+    squares = [x * 8 + y % 8 for x, y in path]
+    if len(squares) < 2:
+        raise ValueError("Tah musí mít aspoň dvě pole.")
+    captured = 0
+    for a, b in zip(squares, squares[1:]):
+        if (a, b) in OVER:
+            mx, my = OVER[a, b]
+            captured |= 1 << (mx * 8 + my)
+        elif len(squares) != 2:
+            raise ValueError("Vícekrokový tah musí být řetězec skoků.")
+    if captured and bin(captured).count("1") != len(squares) - 1:
+        raise ValueError("Vícekrokový tah musí být řetězec skoků.")
+    return encode_move(squares[0], squares[1:], captured)
+
+
+def move_str(move):
+    """Čitelný zápis tahu, např. '2,2 -> 4,4 -> 6,6'"""
+    return " -> ".join(f"{x},{y}" for x, y in move_path(move))
+
+
+def is_jump(move):
+    """Je tah skokem (braním)?"""
+    return move >> CAPTURE_SHIFT != 0
+
+
+def captures_available(moves):
+    """Jsou v seznamu z generate_moves skoky? (pak jsou to jen skoky)"""
+    return bool(moves) and is_jump(moves[0])
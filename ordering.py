@@ -0,0 +1,117 @@
+# ordering.py
+# Řazení tahů pro alfa-beta: čím dřív přijde tah, který způsobí ořezání,
+# tím méně uzlů se prohledá. Pořadí:
+#   1) tah z transpoziční tabulky (nebo předchozí nejlepší)
+#   2) braní, dřív delší řetězce a braní dam
+#   3) vražední tahy (killer) - tiché tahy, které v tomtéž půltahu už ořezaly
+#   4) historie - tiché tahy podle toho, jak často jinde ořezávaly
+# Při shodě se zachová původní pořadí (náhodné zamíchání v kořeni).
+
+from movegen import CAPTURE_SHIFT, is_jump, move_to
+from piece import QUEEN
+
+HASH_BONUS = 1 << 30
+CAPTURE_BONUS = 1 << 29
+KILLER_BONUS = 1 << 28
+HISTORY_MAX = KILLER_BONUS - 1
+
+MAX_PLY = 128
+
+SOURCES = ("hash", "capture", "killer", "history", "other")
+
+
+class MoveOrderer:
+    """
+    Vražední tahy (dva na půltah) a tabulka historie [barva][z pole * 64 + na pole].
+    Historie přežívá mezi hledáními (v new_search se jen zmenší na polovinu),
+    vražední tahy platí jen v rámci jednoho hledání.
+    """
+
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = ([0] * 4096, [0] * 4096)     # indexováno kódem barvy
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.cutoff_sources = dict.fromkeys(SOURCES, 0)
+
+    def new_search(self):
+        """Před novým hledáním: smaže vražedné tahy a zestárne historii"""
+        for slot in self.killers:
+            slot[0] = slot[1] = None
+        for table in self.history:
+            for i, value in enumerate(table):
+                if value:
+                    table[i] = value >> 1
+        self.reset_stats()
+
+    def order(self, board, moves, side, ply, hash_move=None):
+        """Seřadí tahy (na místě) pro stranu s kódem barvy side v daném půltahu"""
+        if len(moves) < 2:
+            return moves
+        pole = board.pole
+        if is_jump(moves[0]):
+            # Povinné braní: jsou to jen skoky; pěšec oběti za 2, dáma za 3
+            def score(move):
+                if move == hash_move:
+                    return HASH_BONUS
+                value = CAPTURE_BONUS
+                mask = move >> CAPTURE_SHIFT
+                while mask:
+                    low = mask & -mask
+                    mx, my = divmod(low.bit_length() - 1, 8)
+                    value += 3 if pole[mx][my].type_code == QUEEN else 2
+                    mask ^= low
+                return value
+        else:
+            killer1, killer2 = self.killers[ply] if ply < MAX_PLY else (None, None)
+            history = self.history[side]
+
+            def score(move):
+                if move == hash_move:
+                    return HASH_BONUS
+                if move == killer1:
+                    return KILLER_BONUS + 1
+                if move == killer2:
+                    return KILLER_BONUS
+                return history[(move & 63) * 64 + move_to(move)]
+        moves.sort(key=score, reverse=True)
+        return moves
+
+    def cutoff(self, moves, move, side, ply, depth, hash_move=None):
+        """Zaznamená tah, který způsobil ořezání (beta cutoff)"""
+        self.cutoffs += 1
+        if move == moves[0]:
+            self.first_move_cutoffs += 1
+        capture = is_jump(move)
+        index = (move & 63) * 64 + move_to(move)
+        if move == hash_move:
+            source = "hash"
+        elif capture:
+            source = "capture"
+        elif ply < MAX_PLY and move in self.killers[ply]:
+            source = "killer"
+        elif self.history[side][index]:
+            source = "history"
+        else:
+            source = "other"
+        self.cutoff_sources[source] += 1
+        if capture:
+            return
+        if ply < MAX_PLY:
+            slot = self.killers[ply]
+            if slot[0] != move:
+                slot[1] = slot[0]
+                slot[0] = move
+        history = self.history[side]
+        history[index] = min(HISTORY_MAX, history[index] + depth * depth)
+
+    def stats(self):
+        """Statistika řazení: počet ořezání, podíl ořezání prvním tahem a původ tahů"""
+        return {
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0,
+            "sources": dict(self.cutoff_sources),
+        }
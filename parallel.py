@@ -0,0 +1,191 @@
+# parallel.py
+# Paralelní prohledávání kořenových tahů ve více procesech (obchází GIL).
+# Každý kořenový tah je samostatná úloha ve frontě ProcessPoolExecutoru,
+# takže volné procesy si berou další tahy samy. Nejlepší dosažené skóre
+# (alfa) sdílí všechny procesy přes multiprocessing.Value.
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from game import Game
+from movegen import generate_moves
+from repetition import RepetitionTracker
+from search import Search, SearchTimeout, WIN, WIN_THRESHOLD
+from zobrist import TranspositionTable
+
+# Tahy se skóre nejvýše o EPS horším než sdílená alfa se prohledají přesně,
+# aby tahy se stejným skóre vrátily stejné číslo bez ohledu na pořadí dokončení
+EPS = 1e-9
+CANCEL_POLL = 0.05      # jak často (sekundy) kontrolovat zrušení při čekání na úlohy
+
+# Stav pracovního procesu (nastaví _init_worker)
+_shared_alpha = None
+_shared_cancel = None
+_tt = None
+
+
+def _init_worker(shared_alpha, shared_cancel, tt_size):
+    global _shared_alpha, _shared_cancel, _tt
+    _shared_alpha = shared_alpha
+    _shared_cancel = shared_cancel
+    _tt = TranspositionTable(tt_size)   # zůstává mezi úlohami stejného procesu
+
+
+def _search_root_move(board, history, color, move, depth, deadline, node_limit, symmetry):
+    """
+    Úloha pracovního procesu: ohodnotí jeden kořenový tah v hloubce depth.
+    deadline je čas podle time.time() (společný pro všechny procesy).
+    Vrací (skóre, přesné?, dokončeno?, počet uzlů).
+    """
+    time_left = None
+    if deadline is not None:
+        time_left = deadline - time.time()
+        if time_left <= 0:
+            return None, False, False, 0
+    from player import Player       # player importuje parallel
+    game = Game(Player("white"), Player("black"), board=board)
+    game.state_history = RepetitionTracker(history)
+    search = Search(game, time_limit=time_left, node_limit=node_limit, tt=_tt,
+                    cancel=_shared_cancel, symmetry=symmetry)
+    search.start()
+    alpha = _shared_alpha.value - EPS
+    try:
+        score = search.search_move(color, move, depth, alpha, WIN + 1)
+    except SearchTimeout:
+        return None, False, False, search.nodes
+    exact = score > alpha
+    if exact:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    return score, exact, True, search.nodes
+
+
+class ParallelSearch:
+    """
+    Iterativní prohlubování s paralelním kořenem. Rozhraní odpovídá Search
+    (iterate, best_move, best_score, depth, nodes). Pool procesů se vytvoří
+    při prvním hledání a drží se až do close(), aby se neplatil start procesů
+    při každém tahu. node_limit je celkový počet uzlů přes všechny procesy.
+    Každý proces má vlastní transpoziční tabulku velikosti tt_size;
+    symmetry se předá jejich hledání (viz Search).
+    """
+
+    def __init__(self, game, workers=None, time_limit=1.5, node_limit=None, max_depth=64,
+                 rng=None, tt_size=1 << 18, cancel=None, progress=None, symmetry=False):
+        self.game = game
+        self.symmetry = symmetry
+        # Zrušení se předá do pracovních procesů (viz _wait), progress jako v Search
+        self.cancel = cancel
+        self.progress = progress
+        self.workers = workers or os.cpu_count() or 1
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.rng = rng
+        self.tt_size = tt_size
+        self.nodes = 0
+        self.depth = 0
+        self.best_move = None
+        self.best_score = None
+        self._pool = None
+        self._shared_alpha = None
+        self._shared_cancel = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._shared_alpha = multiprocessing.Value("d", -WIN - 1)
+            self._shared_cancel = multiprocessing.Event()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._shared_alpha, self._shared_cancel,
+                                                       self.tt_size))
+        return self._pool
+
+    def _wait(self, futures):
+        """
+        Počká na výsledky úloh; vrátí je, nebo None při zrušení. Zrušení
+        se předá procesům přes sdílenou událost (hledání v nich skončí do
+        CHECK_EVERY uzlů) a úlohy čekající ve frontě se zruší rovnou.
+        """
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=CANCEL_POLL)
+            if pending and self.cancel is not None and self.cancel.is_set():
+                self._shared_cancel.set()
+                for future in pending:
+                    future.cancel()
+                # Běžící úlohy skončí hned; až pak smí začít další hledání
+                wait(pending)
+                return None
+        return [f.result() for f in futures]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def iterate(self, color):
+        """Prohledává hloubku 1, 2, ... dokud nedojde rozpočet; vrátí nejlepší tah"""
+        self.nodes = 0
+        self.depth = 0
+        self.best_score = None
+        deadline = None if self.time_limit is None else time.time() + self.time_limit
+
+        moves = generate_moves(self.game.board, color)
+        if not moves:
+            self.best_move = None
+            return None
+        if self.rng is not None:
+            self.rng.shuffle(moves)
+        self.best_move = moves[0]
+        if len(moves) == 1:
+            return self.best_move
+
+        pool = self._ensure_pool()
+        self._shared_cancel.clear()
+        board = self.game.board
+        history = list(self.game.state_history)
+        for depth in range(1, self.max_depth + 1):
+            if deadline is not None and time.time() >= deadline:
+                break
+            if self.cancel is not None and self.cancel.is_set():
+                break
+            node_left = None
+            if self.node_limit is not None:
+                node_left = self.node_limit - self.nodes
+                if node_left <= 0:
+                    break
+                node_left = max(1, node_left // len(moves))
+
+            self._shared_alpha.value = -WIN - 1
+            futures = [pool.submit(_search_root_move, board, history, color, move, depth,
+                                   deadline, node_left, self.symmetry)
+                       for move in moves]
+            results = self._wait(futures)
+            if results is None:
+                break
+            self.nodes += sum(r[3] for r in results)
+
+            # Deterministické sloučení: nejvyšší přesné skóre, při shodě
+            # dřív zařazený tah (předchozí nejlepší je vždy první)
+            best_index = None
+            for index, (score, exact, done, _) in enumerate(results):
+                if done and exact and (best_index is None or score > results[best_index][0]):
+                    best_index = index
+            complete = all(r[2] for r in results)
+            if best_index is None or (not complete and not results[0][2]):
+                # Nedokončená iterace bez výsledku pro předchozí nejlepší tah
+                break
+            move, score = moves[best_index], results[best_index][0]
+            self.best_move = move
+            if not complete:
+                break
+            self.best_score, self.depth = score, depth
+            if self.progress is not None:
+                self.progress(move, score, depth, self.nodes)
+            moves.insert(0, moves.pop(best_index))
+            if abs(score) >= WIN_THRESHOLD:
+                break
+        return self.best_move
@@ -0,0 +1,123 @@
+# perft.py
+# Perft: počet listů stromu legálních tahů do dané hloubky.
+# Slouží ke kontrole správnosti generátoru tahů (čísla se nesmí změnit)
+# a jako základ benchmarku rychlosti.
+#
+#   python perft.py --depth 6
+#   python perft.py --depth 4 --position skoky --divide
+
+import argparse
+import time
+
+from board import Board
+from heuristics import opp
+from movegen import generate_moves, move_str
+from piece import Piece
+
+# Textový zápis pozice: 8 řádků (x = 0..7) oddělených '/', v každém 8 polí
+# (y = 0..7): '.' prázdné, 'w'/'W' bílý pěšec/dáma, 'b'/'B' černý pěšec/dáma;
+# za mezerou barva na tahu ('w' nebo 'b').
+_SYMBOLS = {
+    ("white", "pawn"): "w", ("white", "queen"): "W",
+    ("black", "pawn"): "b", ("black", "queen"): "B",
+}
+_PIECES = {symbol: Piece(*kind) for kind, symbol in _SYMBOLS.items()}
+
+# Uložené pozice pro perft (start + typické situace na kruhové desce)
+POSITIONS = {
+    "start": ".w.w.w.w/w.w.w.w./......../......../......../......../.b.b.b.b/b.b.b.b. w",
+    # skoky přes okraj sloupců, povinné braní
+    "skoky": ".w....../b......./.b.w..../......b./...b..../..w...../.b...b../........ w",
+    # dámy honící se po válci
+    "damy": "......../W......./......../..b...../......../....B.../.......W/........ b",
+    # pěšci těsně před proměnou
+    "promena": "......../......../......../......../...b..../......../.w.w.w../b.b..... w",
+}
+
+# Očekávané počty listů pro hloubky 1, 2, ... (ověřeno nezávislým naivním
+# generátorem podle Piece.krok/skok; skok je celý řetězec; kontroluje se v testech)
+EXPECTED = {
+    "start": [8, 64, 576, 5184, 49536, 458912],
+    "skoky": [2, 15, 34, 156, 526],
+    "damy": [6, 41, 206, 1226, 6117],
+    "promena": [3, 8, 20, 72, 296],
+}
+
+
+def parse_position(text, board_cls=Board):
+    """Vrátí (deska, barva na tahu) ze zápisu pozice"""
+    rows, side = text.split()
+    rows = rows.split("/")
+    if len(rows) != 8 or any(len(row) != 8 for row in rows) or side not in ("w", "b"):
+        raise ValueError(f"Neplatný zápis pozice: {text!r}")
+    board = board_cls()
+    board.pole = [[_PIECES[c] if c != "." else 0 for c in row] for row in rows]
+    board.refresh_key()
+    return board, "white" if side == "w" else "black"
+
+
+def position_text(board, color):
+    """Zápis pozice (opak parse_position)"""
+    rows = ["".join(_SYMBOLS[p.color, p.type] if p != 0 else "." for p in row)
+            for row in board.pole]
+    return "/".join(rows) + (" w" if color == "white" else " b")
+
+
+def perft(board, color, depth):
+    """Počet listů stromu legálních tahů hloubky depth"""
+    if depth == 0:
+        return 1
+    moves = generate_moves(board, color)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    other = opp(color)
+    for move in moves:
+        undo = board.make_move(move)
+        nodes += perft(board, other, depth - 1)
+        board.unmake_move(undo)
+    return nodes
+
+
+def divide(board, color, depth):
+    """Perft rozepsaný po tazích z kořene: {tah: počet listů}"""
+    result = {}
+    other = opp(color)
+    for move in generate_moves(board, color):
+        undo = board.make_move(move)
+        result[move] = perft(board, other, depth - 1)
+        board.unmake_move(undo)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft pro kruhovou dámu.")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--position", default="start",
+                        help="název uložené pozice nebo zápis pozice")
+    parser.add_argument("--divide", action="store_true", help="rozpis po tazích z kořene")
+    parser.add_argument("--bitboard", action="store_true", help="použít BitBoard")
+    args = parser.parse_args(argv)
+
+    board_cls = Board
+    if args.bitboard:
+        from bitboard import BitBoard
+        board_cls = BitBoard
+    board, color = parse_position(POSITIONS.get(args.position, args.position), board_cls)
+
+    for depth in range(1, args.depth + 1):
+        start = time.perf_counter()
+        nodes = perft(board, color, depth)
+        elapsed = time.perf_counter() - start
+        rate = nodes / elapsed if elapsed > 0 else float("inf")
+        print(f"hloubka {depth}: {nodes} listů, {elapsed:.3f} s, {rate:,.0f} listů/s")
+    if args.divide:
+        total = 0
+        for move, count in sorted(divide(board, color, args.depth).items()):
+            print(f"{move_str(move)}: {count}")
+            total += count
+        print(f"celkem: {total}")
+
+
+if __name__ == "__main__":
+    main()
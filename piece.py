@@ -1,30 +1,72 @@
+from tables import STEPS, JUMPS, directions
+
+WHITE, BLACK = 0, 1         # kódy barev
+PAWN, QUEEN = 0, 1          # kódy typů
+
+
 class Piece:
-    def __init__(self, color, piece_type):
-        self.color = color
-        self.type = piece_type
+    """
+    Figurka je neměnná a každý ze čtyř druhů existuje jen jednou:
+    Piece("white", "pawn") vrací vždy stejný objekt, takže lze porovnávat
+    identitou (piece is WHITE_QUEEN) nebo celočíselnými kódy.
+    code = 2 * color_code + type_code (0..3) slouží jako index do tabulek.
+    """
+    __slots__ = ("color", "type", "color_code", "type_code", "code",
+                 "steps", "jumps", "_krok", "_skok")
+    _instances = {}
+
+    def __new__(cls, color, piece_type):
+        try:
+            return cls._instances[color, piece_type]
+        except KeyError:
+            raise ValueError(f"Neznámá figurka: {color} {piece_type}.") from None
+
+    @classmethod
+    def _create(cls, color, piece_type):
+        piece = object.__new__(cls)
+        dirs = directions(color, piece_type)
+        values = {
+            "color": color,
+            "type": piece_type,
+            "color_code": WHITE if color == "white" else BLACK,
+            "type_code": QUEEN if piece_type == "queen" else PAWN,
+            # řádky předpočítaných tabulek pro tuto figurku, indexované polem
+            "steps": STEPS[color, piece_type],
+            "jumps": JUMPS[color, piece_type],
+            "_krok": dirs,
+            "_skok": tuple((2 * dx, 2 * dy) for dx, dy in dirs),
+        }
+        values["code"] = 2 * values["color_code"] + values["type_code"]
+        for name, value in values.items():
+            object.__setattr__(piece, name, value)
+        cls._instances[color, piece_type] = piece
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Piece je neměnná.")
+
+    def __reduce__(self):
+        # Po unpicklingu (např. v jiném procesu) zůstane figurka singletonem
+        return Piece, (self.color, self.type)
 
     def __repr__(self):
         return f"{self.color} {self.type}"
 
     def krok(self):
-        if self.type == "pawn":
-            if self.color == "white":
-                return [(1, 1), (1, -1)]
-            else:
-                return [(-1, 1), (-1, -1)]
-        elif self.type == "queen":
-            return [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        return self._krok
 
     def skok(self):
-        if self.type == "pawn":
-            if self.color == "white":
-                return [(2, 2), (2, -2)]
-            else:
-                return [(-2, 2), (-2, -2)]
-        elif self.type == "queen":
-            return [(2, 2), (2, -2), (-2, 2), (-2, -2)]
+        return self._skok
+
+    def promoted(self):
+        """Vrátí dámu stejné barvy"""
+        return QUEENS[self.color_code]
 
 
-from sys import exit
+WHITE_PAWN = Piece._create("white", "pawn")
+WHITE_QUEEN = Piece._create("white", "queen")
+BLACK_PAWN = Piece._create("black", "pawn")
+BLACK_QUEEN = Piece._create("black", "queen")
 
- 
\ No newline at end of file
+PIECES = (WHITE_PAWN, WHITE_QUEEN, BLACK_PAWN, BLACK_QUEEN)   # indexováno kódem
+QUEENS = (WHITE_QUEEN, BLACK_QUEEN)                            # indexováno barvou
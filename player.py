@@ -1,6 +1,15 @@
 import random
-from heuristics import evaluate_position
 import time
+from book import OpeningBook
+from heuristics import opp
+from parallel import ParallelSearch
+from movegen import generate_moves
+from ordering import MoveOrderer
+from search import Search, tt_key
+from symmetry import untransform_move
+from stats import GameStats, SearchStats
+from tablebase import Tablebases
+from zobrist import TranspositionTable, position_key
 
 class Player:
     def __init__(self, color):
@@ -30,93 +39,177 @@ class HumanPlayer(Player):
         return False
 
 class AIPlayer(Player):
-    def __init__(self, color):
+    def __init__(self, color, time_limit=1.5, node_limit=None, max_depth=64, seed=None,
+                 tt_size=1 << 18, workers=1, book=None, tablebase=None, ponder=False,
+                 stats=False, stats_output=None, term_timing=False, symmetry=False):
         super().__init__(color)
+        # Rozpočet na jeden tah: sekundy a/nebo počet uzlů (None = bez omezení)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.rng = random.Random(seed)
+        self.tt = TranspositionTable(tt_size)  # sdílená mezi tahy
+        self.symmetry = symmetry                # kanonické klíče v tabulce (viz Search)
+        self.orderer = MoveOrderer()            # historie řazení tahů, také mezi tahy
+        self.last_search = None
+        # workers > 1 (nebo None = všechna jádra): kořenové tahy se dělí mezi procesy;
+        # procesy mají vlastní tabulky velikosti tt_size, měření hledání neumí
+        if workers != 1 and (stats or stats_output is not None or term_timing):
+            raise ValueError("Měření hledání (stats) funguje jen s workers=1.")
+        self.workers = workers
+        self._parallel = None
+        # Knihovna zahájení: OpeningBook nebo cesta k souboru (otevře se při prvním tahu)
+        self.book = book
+        self._opened = []       # (atribut, cesta) knihovny a databáze otevřených z cesty
+        # Databáze koncovek: Tablebases nebo adresář; při málo figurkách nahradí hledání
+        self.tablebase = tablebase
+        # Přemýšlení v čase soupeře (viz ponder); výsledek čeká na tah soupeře
+        self.use_ponder = ponder
+        self._pondered = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # Měření hledání (stats.py): last_stats pro poslední tah, game_stats pro celou hru;
+        # stats_output je soubor, kam se každý tah připíše jako JSON line
+        self.term_timing = term_timing
+        self.last_stats = None
+        self.game_stats = None
+        if stats or stats_output is not None or term_timing:
+            self.game_stats = GameStats(stats_output)
 
     def is_ai_player(self):
         return True
 
-    def get_move(self, game):
-        """Vrátí nejlepší tah podle heuristické funkce."""
-        color = self.color
+    def get_move(self, game, cancel=None, progress=None):
+        """
+        Vrátí nejlepší tah nalezený prohledáváním do hloubky.
+        cancel a progress se předají hledání (viz Search).
+        """
+        move = self._book_move(game)
+        if move is None:
+            move = self._tablebase_move(game)
+        if move is not None:
+            self.last_search = None
+            return move
+        time_limit, node_limit = self.time_limit, self.node_limit
+        pondered = self._take_pondered(game)
+        if pondered is not None:
+            # Soupeř zahrál předpovězený tah: čas a uzly z přemýšlení se započítají,
+            # tabulka je zahřátá, takže hledání rychle dožene dosaženou hloubku
+            search, seconds = pondered
+            if time_limit is not None:
+                time_limit -= seconds
+            if node_limit is not None:
+                node_limit -= search.nodes
+            if search.depth >= self.max_depth or (time_limit is not None and time_limit <= 0) \
+                    or (node_limit is not None and node_limit <= 0):
+                self.last_search = search
+                return search.best_move
+        if self.workers != 1:
+            return self._get_move_parallel(game, cancel, progress)
+        stats = SearchStats(self.term_timing) if self.game_stats is not None else None
+        search = Search(game, time_limit=time_limit, node_limit=node_limit,
+                        max_depth=self.max_depth, rng=self.rng, tt=self.tt,
+                        cancel=cancel, progress=progress, stats=stats, orderer=self.orderer,
+                        symmetry=self.symmetry)
+        move = search.iterate(self.color)
+        self.last_search = search
+        if stats is not None:
+            self.last_stats = stats
+            self.game_stats.add(stats, color=self.color, ply=len(game.state_history) - 1)
+        return move
+
+    def ponder(self, game, cancel=None, progress=None):
+        """
+        Přemýšlení v čase soupeře (game je pozice se soupeřem na tahu):
+        odhadne jeho nejpravděpodobnější tah (nejlepší tah z transpoziční
+        tabulky, jinak mělké hledání), zahraje ho na kopii a hledá vlastní
+        odpověď, dokud ho nezruší cancel nebo nedojde na max_depth.
+        Výsledek si pamatuje pro get_move. Vrací předpovězený tah soupeře.
+        """
+        self._pondered = None
+        other = opp(self.color)
         board = game.board
-        
-        # Generování možných tahů
-        def gen_moves(skok):
-            """Generuje všechny možné tahy (skoky nebo kroky)."""
-            moves = []
-            my_figs_w, my_figs_b = game.vsechny_figurky()
-            my_figs = my_figs_w if color == "white" else my_figs_b
-            
-            for x, y in my_figs:
-                p = board.pole[x][y]
-                for dx, dy in (p.skok() if skok else p.krok()):
-                    x2, y2 = x + dx, (y + dy) % 8
-                    if not board.je_v_poli(x2, y2) or not board.je_volne(x2, y2):
-                        continue
-                    if p.type == "pawn" and ((color == "white" and dx < 0) or (color == "black" and dx > 0)):
-                        continue
-                    if skok:
-                        mx, my = (x + x2) // 2, board.middle_col(y, y2)
-                        victim = board.pole[mx][my]
-                        if victim == 0 or victim.color == color:
-                            continue
-                    moves.append((x, y, x2, y2))
-            return moves
+        moves = generate_moves(board, other)
+        if not moves:
+            return None
+        key, transform = tt_key(board, other, self.symmetry)
+        entry = self.tt.probe(key)
+        predicted = None
+        if entry is not None and entry[3] is not None:
+            predicted = untransform_move(entry[3], transform)
+            if predicted not in moves:
+                predicted = None
+        if predicted is None:
+            guess = Search(game, time_limit=None, max_depth=3, tt=self.tt, cancel=cancel,
+                           symmetry=self.symmetry)
+            predicted = guess.iterate(other)
+            if cancel is not None and cancel.is_set():
+                return None
 
-        # Simulace tahu a vyhodnocení pozice
-        def evaluate_move(move):
-            """Simuluje tah a vrací ohodnocení výsledné pozice."""
-            x1, y1, x2, y2 = move
-            
-            # Uložení původního stavu
-            original_piece = board.pole[x1][y1]
-            target = board.pole[x2][y2]
-            
-            # Simulace tahu
-            board.pole[x2][y2] = original_piece
-            board.pole[x1][y1] = 0
-            
-            # U skoku odstraníme přeskočenou figurku
-            is_jump = abs(x2 - x1) == 2
-            if is_jump:
-                mx = (x1 + x2) // 2
-                my = board.middle_col(y1, y2)
-                captured = board.pole[mx][my]
-                board.pole[mx][my] = 0
-            
-            # Vyhodnocení pozice
-            score = evaluate_position(game, color)
-            
-            # Obnova původního stavu
-            board.pole[x1][y1] = original_piece
-            board.pole[x2][y2] = target
-            if is_jump:
-                board.pole[mx][my] = captured
-                
-            return score
-        
-        # Vybereme typ tahů podle pravidel
-        if game.moznostSkoku(color):
-            # Pokud existuje povinný skok, musíme ho provést
-            possible_moves = gen_moves(True)
-        else:
-            # Jinak můžeme provést normální tah
-            possible_moves = gen_moves(False)
-            
-        if not possible_moves:
+        game = game.snapshot()
+        game.board.make_move(predicted)
+        game.state_history.push(position_key(game.board, self.color))
+        start = time.perf_counter()
+        search = Search(game, time_limit=None, node_limit=None, max_depth=self.max_depth,
+                        rng=self.rng, tt=self.tt, cancel=cancel, progress=progress,
+                        orderer=self.orderer, symmetry=self.symmetry)
+        search.iterate(self.color)
+        if search.depth > 0:
+            key = position_key(game.board, self.color)
+            self._pondered = (key, search, time.perf_counter() - start)
+        return predicted
+
+    def _take_pondered(self, game):
+        """Výsledek přemýšlení, pokud soupeř zahrál předpovězený tah (jinak None)"""
+        if self._pondered is None:
             return None
-        
-        # Ohodnocení všech možných tahů
-        moves_with_scores = [(move, evaluate_move(move)) for move in possible_moves]
-        
-        # Seřazení tahů podle skóre (od nejlepšího)
-        moves_with_scores.sort(key=lambda x: x[1], reverse=True)
-        
-        # Vybereme nejlepší tah (případně náhodně z několika nejlepších)
-        best_score = moves_with_scores[0][1]
-        best_moves = [move for move, score in moves_with_scores if score == best_score]
-        time.sleep(1.5)
-        return random.choice(best_moves)
+        key, search, seconds = self._pondered
+        self._pondered = None
+        if key != position_key(game.board, self.color):
+            self.ponder_misses += 1
+            return None
+        self.ponder_hits += 1
+        return search, seconds
+
+    def _book_move(self, game):
+        if self.book is None:
+            return None
+        if isinstance(self.book, str):
+            self._opened.append(("book", self.book))
+            self.book = OpeningBook(self.book)
+        return self.book.choose(game.board, self.color, rng=self.rng)
+
+    def _tablebase_move(self, game):
+        if self.tablebase is None:
+            return None
+        if isinstance(self.tablebase, str):
+            self._opened.append(("tablebase", self.tablebase))
+            self.tablebase = Tablebases(self.tablebase)
+        return self.tablebase.best_move(game.board, self.color)
 
+    def _get_move_parallel(self, game, cancel=None, progress=None):
+        if self._parallel is None:
+            self._parallel = ParallelSearch(game, workers=self.workers, time_limit=self.time_limit,
+                                            node_limit=self.node_limit, max_depth=self.max_depth,
+                                            rng=self.rng, tt_size=self.tt.size,
+                                            symmetry=self.symmetry)
+        self._parallel.game = game
+        self._parallel.cancel = cancel
+        self._parallel.progress = progress
+        move = self._parallel.iterate(self.color)
+        self.last_search = self._parallel
+        return move
 
+    def close(self):
+        """
+        Ukončí pracovní procesy paralelního hledání a zavře knihovnu
+        či databázi, které si hráč sám otevřel z cesty
+        """
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+        # Zavřené se vrátí na cestu, při dalším tahu se případně otevřou znovu
+        for name, path in self._opened:
+            getattr(self, name).close()
+            setattr(self, name, path)
+        self._opened.clear()
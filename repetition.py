@@ -0,0 +1,52 @@
+# repetition.py
+# Sledování opakování pozic v konstantním čase.
+# Udržuje počty výskytů klíčů (slovník) a zásobník pro vracení tahů,
+# takže prohledávání může pozice přidávat a zase odebírat.
+
+
+class RepetitionTracker:
+    """
+    Historie zobrist klíčů s O(1) dotazem na počet výskytů.
+    Navenek se chová jako seznam (append, count, len, indexování,
+    iterace), aby mohla nahradit původní Game.state_history.
+    """
+
+    def __init__(self, keys=()):
+        self.counts = {}
+        self.stack = []
+        for key in keys:
+            self.push(key)
+
+    def push(self, key):
+        """Přidá pozici na konec historie"""
+        self.stack.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    append = push
+
+    def pop(self):
+        """Odebere a vrátí poslední pozici"""
+        key = self.stack.pop()
+        remaining = self.counts[key] - 1
+        if remaining:
+            self.counts[key] = remaining
+        else:
+            del self.counts[key]
+        return key
+
+    def count(self, key):
+        """Kolikrát se pozice v historii vyskytla"""
+        return self.counts.get(key, 0)
+
+    def clear(self):
+        self.counts.clear()
+        self.stack.clear()
+
+    def __len__(self):
+        return len(self.stack)
+
+    def __iter__(self):
+        return iter(self.stack)
+
+    def __getitem__(self, index):
+        return self.stack[index]
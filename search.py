@@ -0,0 +1,288 @@
+# search.py
+# Prohledávání stromu tahů pro AI: negamax s alfa-beta ořezáváním
+# a iterativním prohlubováním v rámci časového nebo uzlového rozpočtu.
+
+import time
+
+from heuristics import IncrementalEvaluator, evaluate_position, opp, repetition_penalty
+from piece import BLACK, WHITE
+from movegen import generate_moves
+from ordering import MoveOrderer
+from symmetry import IDENTITY, canonical, transform_move, untransform_move
+from zobrist import EXACT, LOWER, UPPER, SIDE_KEY, TranspositionTable, position_key
+
+WIN = 10000.0           # skóre výhry (zmenšené o počet půltahů do výhry)
+WIN_THRESHOLD = WIN - 1000
+CHECK_EVERY = 64        # jak často (v uzlech) kontrolovat čas
+
+
+class SearchTimeout(Exception):
+    """Vyčerpán časový nebo uzlový rozpočet prohledávání"""
+
+
+def tt_key(board, color, symmetry=False):
+    """Klíč pozice v transpoziční tabulce a transformace jejích tahů: (klíč, t)"""
+    if symmetry:
+        return canonical(board.sym_key, color)
+    return position_key(board, color), IDENTITY
+
+
+class Search:
+    """
+    Iterativně prohlubovaný negamax s alfa-beta ořezáváním.
+    Rozpočet: time_limit (sekundy) a/nebo node_limit (počet uzlů);
+    None znamená bez omezení. Vždy se zastaví nejpozději na max_depth.
+    Transpoziční tabulku lze předat zvenku, aby přežila mezi tahy.
+    Listy se hodnotí inkrementálně; debug_eval=True je navíc v každém listu
+    porovná s úplným evaluate_position.
+    cancel je příznak zrušení (cokoliv s is_set(), např. threading.Event);
+    progress(tah, skóre, hloubka, uzly) se volá po každé dokončené hloubce.
+    stats (SearchStats) sbírá měření hledání; bez něj se nic neměří.
+    orderer (MoveOrderer) řadí tahy; předaný zvenku si drží historii mezi tahy.
+    symmetry=True: transpoziční tabulka se indexuje kanonickým klíčem
+    (symmetry.py), takže symetrické pozice sdílí záznam. Hodnocení centra
+    (sloupce 2..5) ale symetrické není, skóre sdílených záznamů se tak
+    mohou o tento člen lišit od vlastního hodnocení pozice.
+    """
+
+    def __init__(self, game, time_limit=1.5, node_limit=None, max_depth=64, rng=None, tt=None,
+                 debug_eval=False, cancel=None, progress=None, stats=None, orderer=None,
+                 symmetry=False):
+        self.game = game
+        self.symmetry = symmetry
+        self.orderer = orderer if orderer is not None else MoveOrderer()
+        self.stats = stats
+        self.cancel = cancel
+        self.progress = progress
+        self.debug_eval = debug_eval
+        self.evaluator = None
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.max_depth = max_depth
+        self.rng = rng
+        self.nodes = 0
+        self.depth = 0              # poslední dokončená hloubka
+        self.best_move = None
+        self.best_score = None
+        self._deadline = None
+        self._iter_move = None      # nejlepší tah rozpracované iterace
+        self._started = None        # (čas, zásahy a minutí TT) na začátku, jen se stats
+
+    def _check_budget(self):
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        if self.nodes % CHECK_EVERY == 0:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self.cancel is not None and self.cancel.is_set():
+                raise SearchTimeout()
+
+    def start(self):
+        """Vynuluje počítadla a spustí odpočet rozpočtu"""
+        self.nodes = 0
+        self.depth = 0
+        self.best_score = None
+        self.tt.new_search()
+        self.orderer.new_search()
+        # Hodnocení se připojí k desce, make_move/unmake_move ho pak udržují
+        self.evaluator = self.game.board.evaluator = IncrementalEvaluator(self.game.board)
+        if self.time_limit is not None:
+            self._deadline = time.perf_counter() + self.time_limit
+        if self.stats is not None:
+            self._started = (time.perf_counter(), self.tt.hits, self.tt.misses)
+
+    def finish_stats(self):
+        """Doplní do stats souhrn hledání (volá iterate na konci)"""
+        stats = self.stats
+        started, hits, misses = self._started
+        stats.seconds = time.perf_counter() - started
+        stats.nodes = self.nodes
+        stats.depth = self.depth
+        stats.move = self.best_move
+        stats.score = self.best_score
+        stats.tt_hits = self.tt.hits - hits
+        stats.tt_misses = self.tt.misses - misses
+        stats.ordering = self.orderer.stats()
+
+    def iterate(self, color):
+        """Prohledává hloubku 1, 2, ... dokud nedojde rozpočet; vrátí nejlepší tah"""
+        self.start()
+        try:
+            return self._iterate(color)
+        finally:
+            self.game.board.evaluator = None
+            if self.stats is not None:
+                self.finish_stats()
+
+    def _iterate(self, color):
+        moves = generate_moves(self.game.board, color)
+        if self.stats is not None:
+            self.stats.movegen_calls += 1
+        if not moves:
+            self.best_move = None
+            return None
+        if self.rng is not None:
+            self.rng.shuffle(moves)    # rovnocenné tahy se vybírají náhodně
+        side = WHITE if color == "white" else BLACK
+        self.orderer.order(self.game.board, moves, side, 0)
+        self.best_move = moves[0]
+        if len(moves) == 1:
+            return self.best_move       # vynucený tah, není co počítat
+
+        try:
+            for depth in range(1, self.max_depth + 1):
+                move, score = self._root(color, moves, depth)
+                self.best_move, self.best_score, self.depth = move, score, depth
+                if self.progress is not None:
+                    self.progress(move, score, depth, self.nodes)
+                # Nejlepší tah jde v další iteraci na řadu jako první
+                moves.remove(move)
+                moves.insert(0, move)
+                if abs(score) >= WIN_THRESHOLD:
+                    break
+        except SearchTimeout:
+            # První tah iterace je předchozí nejlepší, takže cokoliv
+            # dokončeného v rozpracované iteraci je přinejmenším stejně dobré
+            if self._iter_move is not None:
+                self.best_move = self._iter_move
+        return self.best_move
+
+    def _make(self, move):
+        """Provede tah na desce (i v připojeném hodnocení) a v historii opakování"""
+        board = self.game.board
+        undo = board.make_move(move)
+        # Klíč s hráčem na tahu (position_key): po tahu bílého hraje černý
+        self.game.state_history.push(board.key ^ SIDE_KEY if undo[1].color_code == WHITE else board.key)
+        return undo
+
+    def _unmake(self, undo):
+        self.game.board.unmake_move(undo)
+        self.game.state_history.pop()
+
+    def evaluate(self, color):
+        """Skóre listu z pohledu hráče na tahu"""
+        if self.debug_eval:
+            self.evaluator.check(self.game, color)
+        stats = self.stats
+        if stats is None:
+            return self.evaluator.score(color) + repetition_penalty(self.game)
+        stats.evals += 1
+        start = time.perf_counter()
+        if stats.term_timing:
+            score = evaluate_position(self.game, color, stats)
+        else:
+            score = self.evaluator.score(color) + repetition_penalty(self.game)
+        stats.eval_seconds += time.perf_counter() - start
+        return score
+
+    def _root(self, color, moves, depth):
+        alpha, beta = -WIN - 1, WIN + 1
+        best_move = None
+        self._iter_move = None
+        for move in moves:
+            score = self.search_move(color, move, depth, alpha, beta)
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+                self._iter_move = move
+        return best_move, alpha
+
+    def search_move(self, color, move, depth, alpha, beta):
+        """Skóre jednoho tahu z kořene (z pohledu 'color') v okně (alpha, beta)"""
+        undo = self._make(move)
+        try:
+            return -self.negamax(opp(color), depth - 1, -beta, -alpha, 1)
+        finally:
+            self._unmake(undo)
+
+    def negamax(self, color, depth, alpha, beta, ply):
+        """Vrátí skóre pozice z pohledu hráče 'color', který je na tahu"""
+        self.nodes += 1
+        self._check_budget()
+
+        board = self.game.board
+        if self.symmetry:
+            key, transform = canonical(board.sym_key, color)
+        else:
+            key = board.key ^ SIDE_KEY if color == "black" else board.key
+            transform = IDENTITY
+        hash_move = None
+        if depth > 0:
+            entry = self.tt.probe(key)
+            if entry is not None:
+                tt_depth, bound, tt_score, hash_move = entry
+                if transform != IDENTITY and hash_move is not None:
+                    hash_move = untransform_move(hash_move, transform)
+                if tt_depth >= depth:
+                    tt_score = _score_from_tt(tt_score, ply)
+                    if bound == EXACT:
+                        return tt_score
+                    if bound == LOWER and tt_score >= beta:
+                        return tt_score
+                    if bound == UPPER and tt_score <= alpha:
+                        return tt_score
+
+        side = WHITE if color == "white" else BLACK
+        if depth <= 0:
+            # List: existenci tahu pozná průběžné hodnocení, tahy se negenerují
+            if not self.evaluator.has_moves(side):
+                return -WIN + ply      # bez tahů (nebo bez figurek) = prohra
+            return self.evaluate(color)
+
+        moves = generate_moves(board, color)
+        if self.stats is not None:
+            self.stats.movegen_calls += 1
+        if not moves:
+            return -WIN + ply          # bez tahů (nebo bez figurek) = prohra
+
+        self.orderer.order(board, moves, side, ply, hash_move)
+
+        alpha_orig = alpha
+        best = -WIN - 1
+        best_move = None
+        for move in moves:
+            undo = self._make(move)
+            try:
+                score = -self.negamax(opp(color), depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self._unmake(undo)
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.orderer.cutoff(moves, move, side, ply, depth, hash_move)
+                        break
+
+        if self.stats is not None:
+            # move je poslední prohledaný tah (při ořezání ten, který ho způsobil)
+            self.stats.record_node(ply, len(moves), moves.index(move) + 1)
+        if best >= beta:
+            bound = LOWER
+        elif best > alpha_orig:
+            bound = EXACT
+        else:
+            bound = UPPER
+        if transform != IDENTITY:
+            best_move = transform_move(best_move, transform)
+        self.tt.store(key, depth, bound, _score_to_tt(best, ply), best_move)
+        return best
+
+
+def _score_to_tt(score, ply):
+    """Skóre výhry/prohry se ukládá relativně k uzlu, ne ke kořeni"""
+    if score >= WIN_THRESHOLD:
+        return score + ply
+    if score <= -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= WIN_THRESHOLD:
+        return score - ply
+    if score <= -WIN_THRESHOLD:
+        return score + ply
+    return score
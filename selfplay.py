@@ -0,0 +1,148 @@
+# selfplay.py
+# Dávkové hraní AI proti AI bez okna a bez čekání.
+# Hry se rozdělí mezi procesy, každá má vlastní semínko, takže běh je
+# opakovatelný (pro úplnou opakovatelnost použijte uzlový rozpočet).
+#
+#   python selfplay.py --games 200 --workers 8 --nodes 2000 --output hry.jsonl
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game import DrawRules, Game
+from movegen import generate_moves
+from player import AIPlayer
+
+
+def play_game(index, seed, ai_options, max_plies=300, random_opening=2, rule_options=None):
+    """
+    Odehraje jednu hru AI proti AI a vrátí výsledek jako slovník.
+    ai_options jsou parametry AIPlayer (time_limit, node_limit, max_depth, book),
+    rule_options parametry DrawRules (opakování, tahy bez braní, rozhodnutí).
+    Prvních random_opening půltahů je náhodných, aby se hry lišily.
+    """
+    rng = random.Random(seed)
+    white = AIPlayer("white", seed=rng.getrandbits(32), **ai_options)
+    black = AIPlayer("black", seed=rng.getrandbits(32), **ai_options)
+    rules = DrawRules(**(rule_options or {}))
+    game = Game(white, black, rules=rules)
+
+    start = time.perf_counter()
+    plies = 0
+    moves = []
+    status = game.game_status()
+    while status["status"] != "game_over" and plies < max_plies:
+        if plies < random_opening:
+            move = rng.choice(generate_moves(game.board, game.current_player))
+        else:
+            move = game.current_player_obj().get_move(game)
+        game.play_move(move)
+        moves.append(move)
+        plies += 1
+        status = game.game_status()
+
+    white.close()
+    black.close()
+    rules.close()
+    if status["status"] == "game_over":
+        winner, reason = status["winner"], status["reason"]
+    else:
+        winner, reason = None, "move_limit"
+    return {
+        "game": index,
+        "seed": seed,
+        "winner": winner,
+        "reason": reason,
+        "plies": plies,
+        "seconds": round(time.perf_counter() - start, 3),
+        "moves": moves,
+    }
+
+
+def _play_game_args(args):
+    return play_game(*args)
+
+
+def run_games(games, seed=0, workers=None, ai_options=None, max_plies=300, random_opening=2,
+              rule_options=None):
+    """Odehraje daný počet her v ProcessPoolExecutor; výsledky jsou seřazené podle čísla hry"""
+    ai_options = ai_options or {}
+    jobs = [(i, seed * 1000003 + i, ai_options, max_plies, random_opening, rule_options)
+            for i in range(games)]
+    if workers == 1:
+        return [play_game(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_play_game_args, jobs, chunksize=max(1, games // 64)))
+
+
+def summarize(results):
+    """Souhrnná statistika výher, remíz a délek her"""
+    lengths = [r["plies"] for r in results]
+    reasons = {}
+    for r in results:
+        reasons[r["reason"]] = reasons.get(r["reason"], 0) + 1
+    n = len(results)
+    return {
+        "games": n,
+        "white_wins": sum(1 for r in results if r["winner"] == "white"),
+        "black_wins": sum(1 for r in results if r["winner"] == "black"),
+        "draws": sum(1 for r in results if r["winner"] is None),
+        "reasons": reasons,
+        "mean_plies": sum(lengths) / n if n else 0.0,
+        "min_plies": min(lengths) if n else 0,
+        "max_plies": max(lengths) if n else 0,
+        "total_seconds": round(sum(r["seconds"] for r in results), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dávkové hraní AI proti AI bez grafiky.")
+    parser.add_argument("--games", type=int, default=10, help="počet her")
+    parser.add_argument("--workers", type=int, default=None, help="počet procesů (výchozí: počet jader)")
+    parser.add_argument("--seed", type=int, default=0, help="základní semínko")
+    parser.add_argument("--nodes", type=int, default=2000, help="uzlový rozpočet na tah")
+    parser.add_argument("--time", type=float, default=None, help="časový rozpočet na tah v sekundách")
+    parser.add_argument("--depth", type=int, default=64, help="maximální hloubka hledání")
+    parser.add_argument("--max-plies", type=int, default=300, help="po kolika půltazích je remíza")
+    parser.add_argument("--repetitions", type=int, default=3,
+                        help="remíza po tolika opakováních pozice (0 = vypnuto)")
+    parser.add_argument("--quiet-moves", type=int, default=40,
+                        help="remíza po tolika tazích bez braní a tahu pěšcem (0 = vypnuto)")
+    parser.add_argument("--material-margin", type=float, default=None,
+                        help="rozhodnout hru při takovém náskoku v materiálu")
+    parser.add_argument("--tablebase", help="rozhodovat podle databáze koncovek v adresáři")
+    parser.add_argument("--random-opening", type=int, default=2, help="počet náhodných úvodních půltahů")
+    parser.add_argument("--book", help="soubor knihovny zahájení")
+    parser.add_argument("--stats", help="soubor pro měření každého tahu (JSON lines)")
+    parser.add_argument("--output", help="soubor pro výsledky jednotlivých her (JSON lines)")
+    parser.add_argument("--summary", help="soubor pro souhrnnou statistiku (JSON)")
+    args = parser.parse_args(argv)
+
+    ai_options = {"node_limit": args.nodes, "time_limit": args.time, "max_depth": args.depth}
+    if args.book:
+        ai_options["book"] = args.book
+    if args.stats:
+        ai_options["stats_output"] = args.stats
+    rule_options = {"repetitions": args.repetitions or None, "quiet_moves": args.quiet_moves or None,
+                    "material_margin": args.material_margin, "tablebase": args.tablebase}
+    results = run_games(args.games, args.seed, args.workers, ai_options,
+                        args.max_plies, args.random_opening, rule_options)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    summary = summarize(results)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# stats.py
+# Měření hledání a hodnocení: uzly, hodnocení, volání generátoru tahů,
+# úspěšnost transpoziční tabulky, větvení po půltazích a čas složek
+# evaluate_position. Bez předaného objektu statistik se nic neměří
+# (v hledání zůstane jen test "is not None").
+#
+# Statistiky jednoho tahu jsou SearchStats, celé hry GameStats; obojí
+# lze převést na slovník (as_dict) a zapisovat jako JSON lines.
+
+import json
+import time
+
+from movegen import move_path
+
+
+class SearchStats:
+    """
+    Statistiky jednoho hledání (jednoho tahu).
+    term_timing=True: listy se hodnotí úplným evaluate_position a měří se
+    čas jeho složek (pomalejší, jen pro profilování).
+    """
+
+    def __init__(self, term_timing=False):
+        self.term_timing = term_timing
+        self.nodes = 0
+        self.evals = 0
+        self.movegen_calls = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        self.depth = 0
+        self.move = None
+        self.score = None
+        self.seconds = 0.0
+        self.eval_seconds = 0.0
+        self.terms = {}             # složka hodnocení -> sekundy
+        self.ordering = None        # statistika řazení tahů (MoveOrderer.stats)
+        self.expanded = {}          # půltah -> počet rozvinutých uzlů
+        self.legal = {}             # půltah -> součet legálních tahů
+        self.searched = {}          # půltah -> součet prohledaných tahů (po ořezání)
+        self._lap = 0.0
+
+    # Měření složek evaluate_position
+
+    def start_laps(self):
+        self._lap = time.perf_counter()
+
+    def lap(self, term):
+        """Připíše čas od posledního volání složce term"""
+        now = time.perf_counter()
+        self.terms[term] = self.terms.get(term, 0.0) + now - self._lap
+        self._lap = now
+
+    # Záznamy z hledání
+
+    def record_node(self, ply, legal, searched):
+        self.expanded[ply] = self.expanded.get(ply, 0) + 1
+        self.legal[ply] = self.legal.get(ply, 0) + legal
+        self.searched[ply] = self.searched.get(ply, 0) + searched
+
+    def branching(self):
+        """Průměrné větvení po půltazích: {půltah: (legální, prohledané)}"""
+        return {ply: (self.legal[ply] / n, self.searched[ply] / n)
+                for ply, n in sorted(self.expanded.items())}
+
+    @property
+    def tt_hit_rate(self):
+        probes = self.tt_hits + self.tt_misses
+        return self.tt_hits / probes if probes else 0.0
+
+    def as_dict(self):
+        return {
+            "move": [list(sq) for sq in move_path(self.move)] if self.move is not None else None,
+            "score": self.score,
+            "depth": self.depth,
+            "seconds": round(self.seconds, 6),
+            "nodes": self.nodes,
+            "nodes_per_sec": round(self.nodes / self.seconds, 1) if self.seconds > 0 else None,
+            "evals": self.evals,
+            "eval_seconds": round(self.eval_seconds, 6),
+            "movegen_calls": self.movegen_calls,
+            "tt_hits": self.tt_hits,
+            "tt_misses": self.tt_misses,
+            "tt_hit_rate": round(self.tt_hit_rate, 4),
+            "branching": {str(ply): [round(legal, 3), round(searched, 3)]
+                          for ply, (legal, searched) in self.branching().items()},
+            "terms": {term: round(seconds, 6) for term, seconds in self.terms.items()},
+            "ordering": self.ordering,
+        }
+
+
+class GameStats:
+    """
+    Statistiky všech tahů jednoho hráče v partii; output je cesta k souboru,
+    kam se každý tah připíše jako JSON line (soubor je otevřený jen při zápisu)
+    """
+
+    def __init__(self, output=None):
+        self.moves = []
+        self.output = output
+
+    def add(self, stats, **extra):
+        """Přidá statistiky tahu (a zapíše je, je-li nastaven výstup)"""
+        self.moves.append(stats)
+        if self.output is not None:
+            record = dict(extra, **stats.as_dict())
+            with open(self.output, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def totals(self):
+        """Součty přes všechny tahy"""
+        total = {"moves": len(self.moves), "nodes": 0, "evals": 0, "movegen_calls": 0,
+                 "tt_hits": 0, "tt_misses": 0, "seconds": 0.0, "eval_seconds": 0.0, "terms": {}}
+        for s in self.moves:
+            for key in ("nodes", "evals", "movegen_calls", "tt_hits", "tt_misses",
+                        "seconds", "eval_seconds"):
+                total[key] += getattr(s, key)
+            for term, seconds in s.terms.items():
+                total["terms"][term] = total["terms"].get(term, 0.0) + seconds
+        probes = total["tt_hits"] + total["tt_misses"]
+        total["tt_hit_rate"] = total["tt_hits"] / probes if probes else 0.0
+        return total
@@ -0,0 +1,121 @@
+# symmetry.py
+# Symetrie kruhové desky a kanonické klíče pozic.
+#
+# Sloupce tvoří válec, takže otočení všech sloupců o k a zrcadlení
+# sloupců (y -> -y) dávají strategicky stejnou pozici. Figurky stojí jen
+# na tmavých polích ((x + y) liché), a ta zachovává jen otočení o sudé k.
+# Otočení o liché k se dá doplnit převrácením řádků (x -> 7 - x) spolu
+# s prohozením barev a hráče na tahu - i to je symetrie pravidel (bílý
+# se mění v černého, poslední řada pěšce zůstane poslední). Dohromady
+# 16 transformací:
+#   t = (zrcadlení, posun, převrácení): y -> (±y + posun) % 8, s převrácením
+#   navíc x -> 7 - x a prohození barev; posun je sudý bez převrácení,
+#   lichý s převrácením.
+#
+# Kanonický klíč pozice je nejmenší klíč přes všechny transformace; vrací
+# se s ním i transformace t, která pozici do kanonické podoby převede.
+# Tah v kanonické podobě se do původní pozice vrátí untransform_move.
+#
+# Deska udržuje všech 16 klíčů najednou (Board.sym_key): pro každou
+# figurku na poli je v SYM_KEYS jedno celé číslo se 16 64bitovými klíči
+# vedle sebe, takže tah stojí jediný XOR navíc.
+
+from heuristics import opp
+from movegen import CAPTURE_SHIFT, COUNT_SHIFT, LANDING_SHIFT, move_landings
+from zobrist import PIECE_KEYS, SIDE_KEY
+
+MASK64 = (1 << 64) - 1
+
+TRANSFORMS = tuple((mirror, shift, flip)
+                   for flip in (0, 1)
+                   for mirror in (0, 1)
+                   for shift in range(flip, 8, 2))
+IDENTITY = 0                        # TRANSFORMS[0] == (0, 0, 0)
+FLIPS = tuple(flip for _, _, flip in TRANSFORMS)
+
+
+def _square(t, sq):
+    mirror, shift, flip = TRANSFORMS[t]
+    x, y = divmod(sq, 8)
+    y = ((-y if mirror else y) + shift) % 8
+    if flip:
+        x = 7 - x
+    return x * 8 + y
+
+
+# SQUARES[t][sq] -> obraz pole sq v transformaci t
+SQUARES = tuple(tuple(_square(t, sq) for sq in range(64)) for t in range(len(TRANSFORMS)))
+# Inverzní transformace: INVERSE[t] vrátí obraz t zpět
+INVERSE = tuple(next(u for u in range(len(TRANSFORMS))
+                     if all(SQUARES[u][SQUARES[t][sq]] == sq for sq in range(64)))
+                for t in range(len(TRANSFORMS)))
+
+# SYM_KEYS[kód figurky][pole]: 16 klíčů obrazů figurky, klíč transformace t v bitech 64t..64t+63
+SYM_KEYS = tuple(
+    tuple(sum(PIECE_KEYS[code ^ 2 if FLIPS[t] else code][SQUARES[t][sq]] << (64 * t)
+              for t in range(len(TRANSFORMS)))
+          for sq in range(64))
+    for code in range(4))
+
+
+def symmetric_key(board):
+    """Spočítá všech 16 klíčů desky od nuly (viz Board.sym_key)"""
+    key = 0
+    for x, row in enumerate(board.pole):
+        for y, piece in enumerate(row):
+            if piece != 0:
+                key ^= SYM_KEYS[piece.code][x * 8 + y]
+    return key
+
+
+def canonical(sym_key, color):
+    """
+    Kanonický klíč ze 16 klíčů desky a hráče na tahu: vrací (klíč, t).
+    Klíč zahrnuje hráče na tahu stejně jako zobrist.position_key.
+    """
+    black = color == "black"
+    best, best_t = None, IDENTITY
+    for t in range(len(TRANSFORMS)):
+        key = sym_key >> (64 * t) & MASK64
+        if black != FLIPS[t]:
+            key ^= SIDE_KEY
+        if best is None or key < best:
+            best, best_t = key, t
+    return best, best_t
+
+
+def canonical_key(board, color):
+    """Kanonický klíč pozice a transformace do kanonické podoby: (klíč, t)"""
+    sym_key = getattr(board, "sym_key", None)
+    if sym_key is None:
+        sym_key = symmetric_key(board)
+    return canonical(sym_key, color)
+
+
+def transform_move(move, t):
+    """Obraz tahu (celé číslo z movegen) v transformaci t"""
+    if t == IDENTITY:
+        return move
+    squares = SQUARES[t]
+    landings = move_landings(move)
+    result = squares[move & 63] | len(landings) << COUNT_SHIFT
+    for i, sq in enumerate(landings):
+        result |= squares[sq] << (LANDING_SHIFT + 6 * i)
+    mask = move >> CAPTURE_SHIFT
+    while mask:
+        low = mask & -mask
+        result |= 1 << (squares[low.bit_length() - 1] + CAPTURE_SHIFT)
+        mask ^= low
+    return result
+
+
+def untransform_move(move, t):
+    """Tah z kanonické podoby (transformace t) zpět do původní pozice"""
+    return transform_move(move, INVERSE[t])
+
+
+def transform_color(color, t):
+    """Barva po transformaci t (převrácení prohazuje barvy)"""
+    if FLIPS[t]:
+        return opp(color)
+    return color
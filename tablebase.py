@@ -0,0 +1,321 @@
+# tablebase.py
+# Databáze koncovek pro pozice s nejvýše K figurkami (retrográdní analýza).
+# Pro každé složení materiálu (např. dvě bílé dámy proti černému pěšci)
+# se vyřeší všechny pozice a uloží do souboru, který se za běhu mapuje
+# do paměti (mmap); dotaz je jen výpočet indexu a přečtení dvou bajtů.
+#
+#   python tablebase.py --pieces 3 --output tablebases
+#
+# Hodnota pozice (int16, z pohledu hráče na tahu):
+#   0      remíza (nekonečné přetahování, nikdo nevynutí výhru)
+#   +n     výhra, hra skončí po n - 1 půltazích
+#   -n     prohra, hra skončí po n - 1 půltazích (-1 = bez tahu, prohrál)
+# Pravidla konce jsou stejná jako v search.py: kdo je na tahu a nemá
+# tah (ani figurku), prohrál.
+#
+# Index pozice: figurky seřazené podle kódu (Piece.code), každá jako číslo
+# tmavého pole 0..31, složené v soustavě o základu 32; ×2 + hráč na tahu.
+# Soubor: hlavička MAGIC (8 B), verze (uint32), počty figurek podle kódu
+# (4× uint8), pak 2 * 32^k hodnot int16 (little-endian).
+
+import argparse
+import itertools
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from bitboard import BitBoard, iter_bits
+from heuristics import opp
+from movegen import _LAST_ROW, generate_moves
+from piece import BLACK, PAWN, PIECES, WHITE
+
+MAGIC = b"DAMATB01"
+VERSION = 2             # 2: braní celými řetězci skoků
+HEADER = struct.Struct("<8sI4B")
+VALUE = struct.Struct("<h")
+
+DEFAULT_DIR = "tablebases"
+MAX_PIECES = 3
+
+# Tmavá pole: číslo 0..31 <-> pole 0..63
+DARK = tuple(x * 8 + y for x in range(8) for y in range(8) if (x + y) % 2 == 1)
+DARK_INDEX = {sq: i for i, sq in enumerate(DARK)}
+
+
+def material_of(codes):
+    """Složení materiálu: počty figurek podle kódu (bílý pěšec, bílá dáma, černý pěšec, černá dáma)"""
+    counts = [0, 0, 0, 0]
+    for code in codes:
+        counts[code] += 1
+    return tuple(counts)
+
+
+def material_name(material):
+    """Jméno souboru, např. (0, 2, 1, 0) -> 'w0p2q-b1p0q.tb'"""
+    wp, wq, bp, bq = material
+    return f"w{wp}p{wq}q-b{bp}p{bq}q.tb"
+
+
+def materials(max_pieces=MAX_PIECES):
+    """
+    Všechna složení do max_pieces figurek (každá strana aspoň jednu)
+    v pořadí závislostí: méně figurek dřív, při stejném počtu méně pěšců
+    dřív (braní vede do menší tabulky, proměna do tabulky s dámou).
+    """
+    result = []
+    for total in range(2, max_pieces + 1):
+        for counts in itertools.product(range(total + 1), repeat=4):
+            if sum(counts) != total or counts[0] + counts[1] == 0 or counts[2] + counts[3] == 0:
+                continue
+            result.append(counts)
+    return sorted(result, key=lambda m: (sum(m), m[0] + m[2], m))
+
+
+def _codes(material):
+    return [code for code, count in enumerate(material) for _ in range(count)]
+
+
+def position_index(pieces, side):
+    """Index pozice; pieces je seznam (pole, kód) seřazený podle kódu, side kód barvy na tahu"""
+    index = 0
+    for sq, _ in pieces:
+        index = index * 32 + DARK_INDEX[sq]
+    return index * 2 + side
+
+
+def _valid(pieces):
+    squares = set()
+    for sq, code in pieces:
+        if sq in squares:
+            return False
+        squares.add(sq)
+        piece = PIECES[code]
+        if piece.type_code == PAWN and sq // 8 == _LAST_ROW[piece.color_code]:
+            return False
+    return True
+
+
+def _successors(board, pieces, side):
+    """
+    Pozice po všech legálních tazích: seznam seřazených seznamů (pole, kód).
+    Tahy dává movegen.generate_moves na prázdné desce board, na kterou se
+    figurky na chvíli rozestaví.
+    """
+    for sq, code in pieces:
+        board.set_piece(*divmod(sq, 8), PIECES[code])
+    result = []
+    for move in generate_moves(board, "white" if side == WHITE else "black"):
+        undo = board.make_move(move)
+        result.append(_pieces(board))
+        board.unmake_move(undo)
+    for sq, _ in pieces:
+        board.set_piece(*divmod(sq, 8), 0)
+    return result
+
+
+def _pieces(board):
+    """Figurky BitBoardu jako seznam (pole, kód) seřazený podle kódu"""
+    squares = board.squares
+    pieces = [(sq, squares[sq].code) for sq in iter_bits(board.white | board.black)]
+    pieces.sort(key=lambda p: p[1])
+    return pieces
+
+
+def solve(material, solved):
+    """
+    Vyřeší jedno složení materiálu. solved je slovník již vyřešených
+    tabulek (materiál -> array), na které vedou braní a proměny.
+    Vrací array('h') délky 2 * 32^k.
+    """
+    codes = _codes(material)
+    k = len(codes)
+    size = 2 * 32 ** k
+    values = array("h", bytes(2 * size))
+
+    # Graf pozic uvnitř tabulky: předchůdci a počet nevyřešených následníků
+    preds = {}
+    remaining = {}
+    buckets = {}        # vzdálenost -> [(index, znaménko)]
+
+    def push(distance, index, sign):
+        buckets.setdefault(distance, []).append((index, sign))
+
+    board = BitBoard()      # prázdná deska pro generování tahů
+    board.pole = [[0] * 8 for _ in range(8)]
+
+    for squares in itertools.product(DARK, repeat=k):
+        pieces = list(zip(squares, codes))
+        if not _valid(pieces):
+            continue
+        for side in (WHITE, BLACK):
+            index = position_index(pieces, side)
+            successors = _successors(board, pieces, side)
+            if not successors:
+                push(1, index, -1)
+                continue
+            internal = 0
+            best_loss = None        # nejkratší prohra soupeře mimo tabulku
+            all_win, max_win = True, 0
+            for child in successors:
+                child_material = material_of(c for _, c in child)
+                other = 1 - side
+                child_index = position_index(child, other)
+                if child_material == material:
+                    preds.setdefault(child_index, []).append(index)
+                    internal += 1
+                    continue
+                if other == WHITE and child_material[0] + child_material[1] == 0 or \
+                        other == BLACK and child_material[2] + child_material[3] == 0:
+                    value = -1      # soupeř přišel o poslední figurku
+                else:
+                    value = solved[child_material][child_index]
+                if value > 0:
+                    max_win = max(max_win, value)
+                    continue
+                all_win = False
+                if value < 0:
+                    best_loss = -value if best_loss is None else min(best_loss, -value)
+            if best_loss is not None:
+                push(best_loss + 1, index, 1)
+            if not all_win:
+                internal = -1       # prohra už nemůže nastat
+            elif internal == 0:
+                push(max_win + 1, index, -1)
+            remaining[index] = (internal, max_win)
+
+    # Zpracování podle vzdálenosti (nejkratší výhra, nejdelší prohra)
+    distance = 1
+    while buckets:
+        for index, sign in buckets.pop(distance, ()):
+            if values[index] != 0:
+                continue
+            values[index] = sign * distance
+            for pred in preds.get(index, ()):
+                if values[pred] != 0:
+                    continue
+                if sign < 0:
+                    push(distance + 1, pred, 1)
+                else:
+                    internal, max_win = remaining[pred]
+                    if internal > 0:
+                        internal -= 1
+                        remaining[pred] = (internal, max_win)
+                        if internal == 0:
+                            push(max(distance, max_win) + 1, pred, -1)
+        distance += 1
+    return values
+
+
+def generate(max_pieces=MAX_PIECES, directory=DEFAULT_DIR, log=None):
+    """Vyřeší všechna složení do max_pieces figurek a uloží je do adresáře"""
+    os.makedirs(directory, exist_ok=True)
+    solved = {}
+    for material in materials(max_pieces):
+        values = solve(material, solved)
+        solved[material] = values
+        with open(os.path.join(directory, material_name(material)), "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, *material))
+            if sys.byteorder == "big":
+                values = array("h", values)
+                values.byteswap()
+            f.write(values.tobytes())
+        if log is not None:
+            log(f"{material_name(material)}: {sum(1 for v in values if v > 0)} výher, "
+                f"{sum(1 for v in values if v < 0)} proher")
+    return solved
+
+
+class Tablebases:
+    """Databáze koncovek z adresáře; tabulky se mapují do paměti při prvním dotazu"""
+
+    def __init__(self, directory=DEFAULT_DIR, max_pieces=MAX_PIECES):
+        self.directory = directory
+        self.max_pieces = max_pieces
+        self._tables = {}       # materiál -> mmap (None = soubor chybí)
+
+    def close(self):
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        self._tables.clear()
+
+    def _table(self, material):
+        if material not in self._tables:
+            path = os.path.join(self.directory, material_name(material))
+            table = None
+            if os.path.exists(path):
+                with open(path, "rb") as f:
+                    table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, *counts = HEADER.unpack_from(table, 0)
+                k = sum(material)
+                if magic != MAGIC or version != VERSION or tuple(counts) != material or \
+                        len(table) != HEADER.size + 4 * 32 ** k:
+                    table.close()
+                    raise ValueError(f"Soubor {path!r} není tabulka koncovek {material}.")
+            self._tables[material] = table
+        return self._tables[material]
+
+    def probe(self, board, color):
+        """Hodnota pozice z pohledu hráče na tahu, nebo None (pozice mimo databázi)"""
+        pieces = []
+        for x, row in enumerate(board.pole):
+            for y, piece in enumerate(row):
+                if piece != 0:
+                    pieces.append((x * 8 + y, piece.code))
+                    if len(pieces) > self.max_pieces:
+                        return None
+        side = WHITE if color == "white" else BLACK
+        material = material_of(c for _, c in pieces)
+        if side == WHITE and material[0] + material[1] == 0 or \
+                side == BLACK and material[2] + material[3] == 0:
+            return -1
+        if material[0] + material[1] == 0 or material[2] + material[3] == 0:
+            return None
+        table = self._table(material)
+        if table is None:
+            return None
+        pieces.sort(key=lambda p: p[1])
+        offset = HEADER.size + 2 * position_index(pieces, side)
+        return VALUE.unpack_from(table, offset)[0]
+
+    def best_move(self, board, color):
+        """
+        Nejlepší tah podle databáze, nebo None (pozice mimo databázi).
+        Vyhrává se nejkratší cestou, prohrává nejdelší, z remízy se hraje remíza.
+        """
+        if self.probe(board, color) is None:
+            return None
+        other = opp(color)
+        best, best_rank = None, None
+        for move in generate_moves(board, color):
+            undo = board.make_move(move)
+            try:
+                value = self.probe(board, other)
+            finally:
+                board.unmake_move(undo)
+            if value is None:
+                return None
+            # Pořadí tahů: rychlá výhra > pomalejší výhra > remíza > pomalá prohra > rychlá prohra
+            if value < 0:
+                rank = (2, value)
+            elif value == 0:
+                rank = (1, 0)
+            else:
+                rank = (0, value)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = move, rank
+        return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generátor databáze koncovek.")
+    parser.add_argument("--pieces", type=int, default=MAX_PIECES, help="největší počet figurek")
+    parser.add_argument("--output", default=DEFAULT_DIR, help="cílový adresář")
+    args = parser.parse_args(argv)
+    generate(args.pieces, args.output, log=print)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# tables.py
+# Předpočítané tabulky tahů pro kruhovou desku 8×8.
+# Sestaví se jednou při importu; index pole je sq = x * 8 + y.
+#   STEPS[(barva, typ)][sq] -> n-tice cílů kroku (x2, y2)
+#   JUMPS[(barva, typ)][sq] -> n-tice skoků (mx, my, x2, y2), (mx, my) je přeskočené pole
+#   OVER[(sq1, sq2)]        -> přeskočené pole (mx, my) pro skok z sq1 na sq2
+#   ZONE[sq]                -> pole, jejichž tahy/ohrožení závisí na obsahu sq
+# Totéž v indexech polí, indexováno kódem figurky (2 * barva + typ, viz Piece.code):
+#   STEP_SQUARES[kód][sq]   -> n-tice cílů kroku
+#   JUMP_SQUARES[kód][sq]   -> n-tice skoků (přeskočené pole, cíl)
+#   NEIGHBOUR_SQUARES[sq]   -> diagonální sousedé
+
+COLORS = ("white", "black")
+TYPES = ("pawn", "queen")
+
+
+def directions(color, piece_type):
+    """Směry (dx, dy), kterými se figurka smí pohybovat"""
+    if piece_type == "queen":
+        return ((1, 1), (1, -1), (-1, 1), (-1, -1))
+    if color == "white":
+        return ((1, 1), (1, -1))
+    return ((-1, 1), (-1, -1))
+
+
+def _build():
+    steps, jumps = {}, {}
+    for color in COLORS:
+        for piece_type in TYPES:
+            dirs = directions(color, piece_type)
+            step_table, jump_table = [], []
+            for sq in range(64):
+                x, y = divmod(sq, 8)
+                step_table.append(tuple(
+                    (x + dx, (y + dy) % 8) for dx, dy in dirs if 0 <= x + dx < 8))
+                jump_table.append(tuple(
+                    (x + dx, (y + dy) % 8, x + 2 * dx, (y + 2 * dy) % 8)
+                    for dx, dy in dirs if 0 <= x + 2 * dx < 8))
+            steps[color, piece_type] = tuple(step_table)
+            jumps[color, piece_type] = tuple(jump_table)
+    return steps, jumps
+
+
+STEPS, JUMPS = _build()
+
+OVER = {(sq, x2 * 8 + y2): (mx, my)
+        for sq, table in enumerate(JUMPS["white", "queen"])
+        for mx, my, x2, y2 in table}
+
+# Diagonální sousedé bez ohledu na barvu (pro formace)
+NEIGHBOURS = STEPS["white", "queen"]
+
+# Pole ve vzdálenosti 0, 1 a 2 po diagonálách (sq samo, sousedé, cíle skoků).
+# Kroky, skoky i ohrožení figurky závisí jen na těchto polích a vztah je
+# symetrický, takže změna na sq ovlivní právě figurky v ZONE[sq].
+ZONE = tuple(
+    tuple(sorted({sq} | {x * 8 + y for x, y in NEIGHBOURS[sq]}
+                 | {x2 * 8 + y2 for _, _, x2, y2 in JUMPS["white", "queen"][sq]}))
+    for sq in range(64))
+
+_BY_CODE = tuple((color, piece_type) for color in COLORS for piece_type in TYPES)
+
+STEP_SQUARES = tuple(
+    tuple(tuple(x2 * 8 + y2 for x2, y2 in STEPS[kind][sq]) for sq in range(64))
+    for kind in _BY_CODE)
+JUMP_SQUARES = tuple(
+    tuple(tuple((mx * 8 + my, x2 * 8 + y2) for mx, my, x2, y2 in JUMPS[kind][sq]) for sq in range(64))
+    for kind in _BY_CODE)
+NEIGHBOUR_SQUARES = tuple(tuple(x * 8 + y for x, y in NEIGHBOURS[sq]) for sq in range(64))
@@ -1,8 +1,64 @@
 import unittest
 from board import Board
-from game import Game
+from game import DrawRules, Game
 from player import Player, HumanPlayer, AIPlayer
 from piece import Piece
+from bitboard import BitBoard
+from tables import STEPS, JUMPS, OVER
+from search import Search
+from movegen import generate_moves, move_from_path, move_path, first_hop, move_from, move_to, is_jump
+from repetition import RepetitionTracker
+from parallel import ParallelSearch
+from heuristics import IncrementalEvaluator, evaluate_position
+from zobrist import board_key, TranspositionTable, EXACT, LOWER
+import bench
+import perft
+import pickle
+import selfplay
+import random
+import os
+import tempfile
+import book
+import shutil
+import tablebase
+import json
+from stats import SearchStats
+from ordering import MoveOrderer
+import time
+import subprocess
+import threading
+import sys
+from worker import AIWorker
+from piece import PIECES
+from symmetry import FLIPS, SQUARES, canonical_key, transform_color, transform_move, untransform_move
+
+try:
+    import batch_eval
+except ImportError:     # NumPy je volitelné
+    batch_eval = None
+
+
+def nahodna_pole(rng, pocet=10):
+    """Vytvoří náhodnou matici 8×8 s figurkami na tmavých polích"""
+    pole = [[0 for _ in range(8)] for _ in range(8)]
+    volna = [(x, y) for x in range(8) for y in range(8) if (x + y) % 2 == 1]
+    for x, y in rng.sample(volna, pocet):
+        pole[x][y] = Piece(rng.choice(["white", "black"]), rng.choice(["pawn", "pawn", "queen"]))
+    return pole
+
+
+def symetricka_deska(board, t):
+    """Obraz desky v transformaci t ze symmetry.TRANSFORMS"""
+    obraz = Board()
+    obraz.pole = [[0 for _ in range(8)] for _ in range(8)]
+    for x in range(8):
+        for y in range(8):
+            piece = board.pole[x][y]
+            if piece:
+                x2, y2 = divmod(SQUARES[t][x * 8 + y], 8)
+                obraz.pole[x2][y2] = PIECES[piece.code ^ 2 if FLIPS[t] else piece.code]
+    obraz.refresh_key()
+    return obraz
 
 class BoardTests(unittest.TestCase):
     def setUp(self):
@@ -180,7 +236,43 @@ class GameTests(unittest.TestCase):
         # Kontrola, že figurky zůstaly na svých místech
         self.assertEqual(self.game.board.pole[1][1].color, "white")
         self.assertEqual(self.game.board.pole[3][3].color, "black")
-    
+
+    def test_retezec_skoku_najednou(self):
+        """Celý řetězec skoků je jeden tah"""
+        self.game.board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        self.game.board.pole[2][2] = Piece("white", "pawn")
+        self.game.board.pole[3][3] = Piece("black", "pawn")
+        self.game.board.pole[5][5] = Piece("black", "pawn")
+        self.game.board.pole[7][0] = Piece("black", "pawn")
+        self.game.board.refresh_key()
+        # Neúplný řetězec není legální tah
+        with self.assertRaises(ValueError):
+            self.game.play_move(move_from_path([(2, 2), (4, 4)]))
+        self.game.play_move(move_from_path([(2, 2), (4, 4), (6, 6)]))
+        self.assertEqual(self.game.board.pole[3][3], 0)
+        self.assertEqual(self.game.board.pole[5][5], 0)
+        self.assertEqual(self.game.board.pole[6][6].color, "white")
+        self.assertEqual(self.game.current_player, "black")
+        self.assertEqual(len(self.game.state_history), 2)     # výchozí pozice a po tahu
+
+    def test_retezec_po_skocich(self):
+        """Po jednotlivých skocích zůstává hráč na tahu, dokud řetězec neskončí"""
+        self.game.board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        self.game.board.pole[2][2] = Piece("white", "pawn")
+        self.game.board.pole[1][1] = Piece("white", "pawn")
+        self.game.board.pole[3][3] = Piece("black", "pawn")
+        self.game.board.pole[5][5] = Piece("black", "pawn")
+        self.game.board.refresh_key()
+        self.game.play_turn(2, 2, 4, 4)
+        self.assertEqual(self.game.current_player, "white")
+        self.assertEqual(self.game.chain, (4, 4))
+        with self.assertRaises(ValueError):
+            self.game.play_turn(1, 1, 2, 2)     # jiná figurka
+        self.game.play_turn(4, 4, 6, 6)
+        self.assertIsNone(self.game.chain)
+        self.assertEqual(self.game.current_player, "black")
+        self.assertEqual(len(self.game.state_history), 2)     # výchozí pozice a po tahu
+
     def test_konec_hry_blokovane_figurky(self):
         """Test konce hry, když jsou všechny figurky zablokovány"""
         self.game.board.pole = [[0 for _ in range(8)] for _ in range(8)]
@@ -226,6 +318,95 @@ class GameTests(unittest.TestCase):
         self.assertEqual(game_status["winner"], "white")
         self.assertEqual(game_status["reason"], "blocked")
 
+class DrawRulesTests(unittest.TestCase):
+    """Pravidla remízy a rozhodnutí partie"""
+
+    def _damy(self, rules):
+        board = Board()
+        board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        board.pole[1][0] = Piece("white", "queen")
+        board.pole[6][1] = Piece("black", "queen")
+        board.refresh_key()
+        return Game(HumanPlayer("white"), HumanPlayer("black"), board=board, rules=rules)
+
+    def _honicka(self, game, kol):
+        """Dámy popojdou a vrátí se (jedno kolo = 4 půltahy)"""
+        for _ in range(kol):
+            game.play_turn(1, 0, 2, 1)
+            game.play_turn(6, 1, 5, 0)
+            game.play_turn(2, 1, 1, 0)
+            game.play_turn(5, 0, 6, 1)
+
+    def test_troji_opakovani(self):
+        game = self._damy(DrawRules())
+        # Výchozí rozestavení se počítá jako první výskyt
+        self._honicka(game, 1)
+        self.assertEqual(game.game_status()["status"], "continue")
+        self._honicka(game, 1)
+        self.assertEqual(game.game_status(), {"status": "game_over", "winner": None, "reason": "repetition"})
+
+    def test_tahy_bez_brani(self):
+        game = self._damy(DrawRules(repetitions=None, quiet_moves=4))
+        self._honicka(game, 1)
+        self.assertEqual(game.game_status()["status"], "continue")
+        self._honicka(game, 1)
+        self.assertEqual(game.game_status()["reason"], "quiet_moves")
+        # Tah pěšcem počítadlo vynuluje
+        game = self._damy(DrawRules(repetitions=None, quiet_moves=1))
+        game.board.set_piece(1, 2, Piece("white", "pawn"))
+        game.play_turn(1, 2, 2, 3)
+        self.assertEqual(game.quiet_plies, 0)
+
+    def test_rozhodnuti_materialem(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"), rules=DrawRules(material_margin=3))
+        self.assertEqual(game.game_status()["status"], "continue")
+        for y in (1, 3, 5):
+            game.board.set_piece(6, y, 0)
+        game._status = None
+        self.assertEqual(game.game_status(), {"status": "game_over", "winner": "white", "reason": "material"})
+
+
+class GameStatusCacheTests(unittest.TestCase):
+    """Stav hry a překreslení okna se mění jen po tahu"""
+
+    def test_stav_do_dalsiho_tahu(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"))
+        stav = game.game_status()
+        self.assertIs(game.game_status(), stav)
+        game.play_turn(1, 2, 2, 3)
+        self.assertIsNot(game.game_status(), stav)
+        self.assertEqual(game.game_status(), game.board.check_game_status())
+
+    def _okno(self, game):
+        from gui import GameWindow
+        kresby = []
+
+        class Renderer:
+            def draw_game_state(self, game, parts, ai_info=None):
+                kresby.append(set(parts))
+
+        okno = GameWindow(game, Renderer())
+        okno._redraw()
+        kresby.clear()
+        return okno, kresby
+
+    def test_tah_prekresli_desku(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"))
+        okno, kresby = self._okno(game)
+        okno._redraw()
+        self.assertEqual(kresby, [])
+        game.play_turn(1, 2, 2, 3)
+        okno._redraw()
+        self.assertEqual(kresby, [{"board", "messages"}])
+
+    def test_zprava_prekresli_jen_zpravy(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"))
+        okno, kresby = self._okno(game)
+        game.add_message("ahoj")
+        okno._redraw()
+        self.assertEqual(kresby, [{"messages"}])
+
+
 class PieceTests(unittest.TestCase):
     """Testy pro třídu Piece"""
     
@@ -235,14 +416,14 @@ class PieceTests(unittest.TestCase):
         white_pawn = Piece("white", "pawn")
         
         # Pohyby bílého pěšce (měl by se pohybovat dopředu a do stran)
-        expected_moves = [(1, 1), (1, -1)]  # Dopředu vlevo, dopředu vpravo
+        expected_moves = ((1, 1), (1, -1))  # Dopředu vlevo, dopředu vpravo
         self.assertEqual(white_pawn.krok(), expected_moves)
         
         # Černý pěšec
         black_pawn = Piece("black", "pawn")
         
         # Pohyby černého pěšce (měl by se pohybovat dozadu a do stran)
-        expected_moves = [(-1, 1), (-1, -1)]  # Dozadu vlevo, dozadu vpravo
+        expected_moves = ((-1, 1), (-1, -1))  # Dozadu vlevo, dozadu vpravo
         self.assertEqual(black_pawn.krok(), expected_moves)
     
     def test_queen_movement(self):
@@ -251,7 +432,7 @@ class PieceTests(unittest.TestCase):
         white_queen = Piece("white", "queen")
         
         # Dáma by se měla pohybovat všemi diagonálními směry
-        expected_moves = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        expected_moves = ((1, 1), (1, -1), (-1, 1), (-1, -1))
         self.assertEqual(white_queen.krok(), expected_moves)
         
         # Černá dáma (stejné pohyby jako bílá)
@@ -264,15 +445,856 @@ class PieceTests(unittest.TestCase):
         white_pawn = Piece("white", "pawn")
         
         # Skoky bílého pěšce
-        expected_jumps = [(2, 2), (2, -2)]  # Dopředu vlevo, dopředu vpravo
+        expected_jumps = ((2, 2), (2, -2))  # Dopředu vlevo, dopředu vpravo
         self.assertEqual(white_pawn.skok(), expected_jumps)
         
         # Dáma
         queen = Piece("white", "queen")
         
         # Skoky dámy ve všech směrech
-        expected_jumps = [(2, 2), (2, -2), (-2, 2), (-2, -2)]
+        expected_jumps = ((2, 2), (2, -2), (-2, 2), (-2, -2))
         self.assertEqual(queen.skok(), expected_jumps)
-        
+
+    def test_singleton(self):
+        """Každý druh figurky existuje jen jednou a je neměnný"""
+        self.assertIs(Piece("white", "pawn"), Piece("white", "pawn"))
+        self.assertIs(Piece("black", "pawn").promoted(), Piece("black", "queen"))
+        self.assertIs(pickle.loads(pickle.dumps(Piece("white", "queen"))), Piece("white", "queen"))
+        with self.assertRaises(AttributeError):
+            Piece("white", "pawn").type = "queen"
+        with self.assertRaises(ValueError):
+            Piece("red", "pawn")
+
+    def test_kody(self):
+        kody = {Piece(c, t).code for c in ("white", "black") for t in ("pawn", "queen")}
+        self.assertEqual(kody, {0, 1, 2, 3})
+        self.assertEqual(Piece("black", "queen").color_code, 1)
+        self.assertEqual(Piece("black", "queen").type_code, 1)
+
+class BitBoardTests(unittest.TestCase):
+    """Testy bitboardové desky proti původní Board"""
+
+    def test_pocatecni_pozice(self):
+        bitboard = Board()
+        rychla = BitBoard()
+        for x in range(8):
+            for y in range(8):
+                self.assertEqual(str(rychla.pole[x][y]), str(bitboard.pole[x][y]))
+
+    def test_shoda_s_board(self):
+        rng = random.Random(1)
+        for _ in range(300):
+            pole = nahodna_pole(rng, rng.randint(2, 14))
+            board = Board()
+            board.pole = [row[:] for row in pole]
+            rychla = BitBoard()
+            rychla.pole = pole
+            self.assertEqual(rychla.pocetfigurek(), board.pocetfigurek())
+            self.assertEqual(rychla.vsechny_figurky(), board.vsechny_figurky())
+            for color in ("white", "black"):
+                self.assertEqual(rychla.moznostSkoku(color), board.moznostSkoku(color))
+                self.assertEqual(rychla.no_moves_available(color), board.no_moves_available(color))
+            self.assertEqual(rychla.check_game_status(), board.check_game_status())
+
+    def test_skok_pres_okraj(self):
+        rychla = BitBoard()
+        rychla.pole = [[0 for _ in range(8)] for _ in range(8)]
+        rychla.pole[2][0] = Piece("white", "pawn")
+        rychla.pole[3][7] = Piece("black", "pawn")
+        self.assertEqual(generate_moves(rychla, "white"), [move_from_path([(2, 0), (4, 6)])])
+        self.assertEqual(rychla.threatened("black"), 1 << (3 * 8 + 7))
+        rychla.perform_jump(2, 0, 4, 6)
+        self.assertEqual(rychla.pole[3][7], 0)
+        self.assertEqual(rychla.pole[4][6].color, "white")
+
+    def test_hra_s_bitboard(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"), board=BitBoard())
+        game.play_turn(1, 0, 2, 1)
+        self.assertEqual(game.board.pole[1][0], 0)
+        self.assertEqual(game.board.pole[2][1].color, "white")
+        self.assertEqual(game.current_player, "black")
+
+    def test_hledani_jako_board(self):
+        # Tahy a průběžné hodnocení nad maskami dávají stejné hledání jako Board
+        vysledky = []
+        for deska in (Board(), BitBoard()):
+            search = Search(Game(HumanPlayer("white"), HumanPlayer("black"), board=deska),
+                            time_limit=None, max_depth=4, debug_eval=True)
+            vysledky.append((search.iterate("white"), search.best_score, search.nodes))
+            self.assertEqual(deska.key, board_key(deska))
+        self.assertEqual(vysledky[0], vysledky[1])
+
+
+class TablesTests(unittest.TestCase):
+    """Testy předpočítaných tabulek tahů"""
+
+    def test_shoda_s_piece(self):
+        board = Board()
+        for color in ("white", "black"):
+            for piece_type in ("pawn", "queen"):
+                piece = Piece(color, piece_type)
+                for x in range(8):
+                    for y in range(8):
+                        kroky = tuple((x + dx, (y + dy) % 8) for dx, dy in piece.krok()
+                                      if board.je_v_poli(x + dx, y + dy))
+                        self.assertEqual(STEPS[color, piece_type][x * 8 + y], kroky)
+                        for mx, my, x2, y2 in JUMPS[color, piece_type][x * 8 + y]:
+                            self.assertEqual(mx, (x + x2) // 2)
+                            self.assertEqual(my, board.middle_col(y, y2))
+
+    def test_over_pres_okraj(self):
+        self.assertEqual(OVER[2 * 8 + 0, 4 * 8 + 6], (3, 7))
+        self.assertEqual(OVER[4 * 8 + 7, 2 * 8 + 1], (3, 0))
+
+
+class MovegenTests(unittest.TestCase):
+    """Testy společného generátoru tahů"""
+
+    def test_povinne_brani(self):
+        board = Board()
+        board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        board.pole[2][2] = Piece("white", "pawn")
+        board.pole[3][3] = Piece("black", "pawn")
+        board.pole[1][5] = Piece("white", "queen")
+        self.assertEqual([move_path(m) for m in generate_moves(board, "white")], [[(2, 2), (4, 4)]])
+        self.assertEqual([move_path(m) for m in generate_moves(board, "black")], [[(3, 3), (1, 1)]])
+
+    def test_retezec_skoku(self):
+        board = Board()
+        board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        board.pole[2][2] = Piece("white", "pawn")
+        board.pole[3][3] = Piece("black", "pawn")
+        board.pole[5][5] = Piece("black", "pawn")
+        board.refresh_key()
+        moves = generate_moves(board, "white")
+        self.assertEqual([move_path(m) for m in moves], [[(2, 2), (4, 4), (6, 6)]])
+        move = moves[0]
+        self.assertTrue(is_jump(move))
+        self.assertEqual((move_from(move), move_to(move)), (2 * 8 + 2, 6 * 8 + 6))
+        self.assertEqual(move_from_path(move_path(move)), move)
+        undo = board.make_move(move)
+        self.assertEqual(board.pole[6][6].color, "white")
+        self.assertEqual((board.pole[3][3], board.pole[5][5]), (0, 0))
+        board.unmake_move(undo)
+        self.assertEqual(board.key, board_key(board))
+        self.assertEqual(board.pole[5][5].color, "black")
+
+    def test_promena_ukonci_retezec(self):
+        board = Board()
+        board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        board.pole[5][1] = Piece("white", "pawn")
+        board.pole[6][2] = Piece("black", "pawn")
+        board.pole[6][4] = Piece("black", "pawn")   # dáma by ho z [7][3] přeskočila
+        board.refresh_key()
+        self.assertEqual([move_path(m) for m in generate_moves(board, "white")], [[(5, 1), (7, 3)]])
+
+    def test_shoda_s_bitboard(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            pole = nahodna_pole(rng, rng.randint(2, 14))
+            board = Board()
+            board.pole = pole
+            rychla = BitBoard()
+            rychla.pole = pole
+            for color in ("white", "black"):
+                # Masky cílů znají jen jednotlivé skoky: porovnají se dopady prvních skoků
+                cile = 0
+                for m in generate_moves(board, color):
+                    cile |= 1 << first_hop(m)[1]
+                maska = 0
+                for cil in rychla.jump_targets(color).values():
+                    maska |= cil
+                if not maska:
+                    for cil in rychla.step_targets(color).values():
+                        maska |= cil
+                self.assertEqual(cile, maska)
+                self.assertEqual(sorted(generate_moves(rychla, color)),
+                                 sorted(generate_moves(board, color)))
+
+
+class SearchTests(unittest.TestCase):
+    """Testy prohledávání pro AIPlayer"""
+
+    def setUp(self):
+        self.game = Game(AIPlayer("white"), AIPlayer("black"))
+
+    def test_vybere_bezpecny_skok(self):
+        pole = [[0 for _ in range(8)] for _ in range(8)]
+        pole[2][2] = Piece("white", "pawn")
+        pole[2][6] = Piece("white", "pawn")
+        pole[3][3] = Piece("black", "pawn")
+        pole[3][7] = Piece("black", "pawn")
+        pole[5][5] = Piece("black", "pawn")  # po skoku přes [3][3] by vzal zpět
+        pole[6][6] = Piece("black", "pawn")  # a skok přes [5][5] nejde prodloužit
+        self.game.board.pole = pole
+        search = Search(self.game, time_limit=None, max_depth=2)
+        self.assertEqual(move_path(search.iterate("white")), [(2, 6), (4, 0)])
+        self.assertEqual(search.depth, 2)
+
+    def test_deska_se_obnovi(self):
+        pred = self.game._board_state_hash()
+        Search(self.game, time_limit=None, max_depth=3).iterate("white")
+        self.assertEqual(self.game._board_state_hash(), pred)
+
+    def test_uzlovy_rozpocet(self):
+        search = Search(self.game, time_limit=None, node_limit=40)
+        move = search.iterate("white")
+        self.assertIn(move, generate_moves(self.game.board, "white"))
+        self.assertLessEqual(search.nodes, 40)
+
+    def test_ai_vrati_legalni_tah(self):
+        player = AIPlayer("white", time_limit=None, max_depth=2, seed=3)
+        self.assertIn(player.get_move(self.game), generate_moves(self.game.board, "white"))
+
+
+class ZobristTests(unittest.TestCase):
+    """Testy zobrist klíčů a transpoziční tabulky"""
+
+    def test_inkrementalni_klic(self):
+        game = Game(HumanPlayer("white"), HumanPlayer("black"))
+        for board in (game.board, BitBoard()):
+            game.board = board
+            game.current, game.current_player = 0, "white"
+            rng = random.Random(5)
+            for _ in range(30):
+                moves = generate_moves(game.board, game.current_player)
+                if not moves:
+                    break
+                game.play_move(rng.choice(moves))
+                self.assertEqual(board.key, board_key(board))
+            self.assertIsInstance(game.state_history[-1], int)
+
+    def test_make_unmake_klic(self):
+        board = Board()
+        board.pole = [[0 for _ in range(8)] for _ in range(8)]
+        board.pole[6][2] = Piece("white", "pawn")
+        board.pole[5][3] = Piece("black", "pawn")
+        board.refresh_key()
+        pred = board.key
+        undo = board.make_move(move_from_path([(6, 2), (7, 1)]))  # proměna
+        self.assertEqual(board.pole[7][1].type, "queen")
+        self.assertEqual(board.key, board_key(board))
+        board.unmake_move(undo)
+        self.assertEqual(board.key, pred)
+
+    def test_make_unmake_nahodne_partie(self):
+        rng = random.Random(13)
+        for board_cls in (Board, BitBoard):
+            for _ in range(10):
+                board = board_cls()
+                board.pole = nahodna_pole(rng, rng.randint(4, 16))
+                board.refresh_key()
+                pred = [list(row) for row in board.pole]
+                color, undos = "white", []
+                for _ in range(20):
+                    moves = generate_moves(board, color)
+                    if not moves:
+                        break
+                    undos.append(board.make_move(rng.choice(moves)))
+                    self.assertEqual(board.key, board_key(board))
+                    color = "black" if color == "white" else "white"
+                while undos:
+                    board.unmake_move(undos.pop())
+                self.assertEqual([list(row) for row in board.pole], pred)
+                self.assertEqual(board.key, board_key(board))
+
+    def test_tabulka(self):
+        tt = TranspositionTable(8)
+        self.assertIsNone(tt.probe(123))
+        tt.store(123, 3, EXACT, 1.5, (1, 0, 2, 1))
+        self.assertEqual(tt.probe(123), (3, EXACT, 1.5, (1, 0, 2, 1)))
+        # mělčí záznam jiné pozice ze stejného hledání hlubší nepřepíše
+        tt.store(123 + 8, 1, LOWER, 0.0, None)
+        self.assertEqual(tt.probe(123)[0], 3)
+        # v novém hledání už ano
+        tt.new_search()
+        tt.store(123 + 8, 1, LOWER, 0.0, None)
+        self.assertIsNone(tt.probe(123))
+        self.assertEqual((tt.hits, tt.misses, tt.replacements), (2, 2, 1))
+
+    def test_velikost(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(100)
+
+
+class RepetitionTests(unittest.TestCase):
+    """Testy sledování opakování pozic"""
+
+    def test_push_pop(self):
+        tracker = RepetitionTracker([1, 2, 1])
+        self.assertEqual(tracker.count(1), 2)
+        self.assertEqual(tracker.count(3), 0)
+        tracker.push(1)
+        self.assertEqual(tracker.count(1), 3)
+        self.assertEqual(tracker.pop(), 1)
+        self.assertEqual(tracker.pop(), 1)
+        self.assertEqual(tracker.count(1), 1)
+        self.assertEqual(list(tracker), [1, 2])
+        self.assertEqual(tracker[-1], 2)
+
+    def test_hledani_vrati_historii(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        game.play_turn(1, 0, 2, 1)
+        pred = list(game.state_history)
+        Search(game, time_limit=None, max_depth=3).iterate("black")
+        self.assertEqual(list(game.state_history), pred)
+        self.assertEqual(game.state_history.count(game._board_state_hash()), 1)
+
+
+class IncrementalEvaluatorTests(unittest.TestCase):
+    """Testy inkrementálního hodnocení proti evaluate_position"""
+
+    def test_shoda_po_tazich(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            game = Game(HumanPlayer("white"), HumanPlayer("black"))
+            game.board.pole = nahodna_pole(rng, rng.randint(4, 16))
+            game.board.refresh_key()
+            # Připojené hodnocení udržují make_move a unmake_move desky
+            evaluator = game.board.evaluator = IncrementalEvaluator(game.board)
+            color = "white"
+            undos = []
+            for _ in range(12):
+                moves = generate_moves(game.board, color)
+                if not moves:
+                    break
+                undos.append(game.board.make_move(rng.choice(moves)))
+                for c, side in (("white", 0), ("black", 1)):
+                    evaluator.check(game, c)
+                    self.assertEqual(evaluator.has_moves(side), bool(generate_moves(game.board, c)))
+                color = "black" if color == "white" else "white"
+            while undos:
+                game.board.unmake_move(undos.pop())
+                evaluator.check(game, "white")
+
+    def test_hledani_s_kontrolou(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        search = Search(game, time_limit=None, max_depth=3, debug_eval=True)
+        self.assertIsNotNone(search.iterate("white"))
+        self.assertAlmostEqual(search.evaluator.score("white"),
+                               evaluate_position(game, "white"))
+
+
+@unittest.skipIf(batch_eval is None, "chybí NumPy")
+class BatchEvalTests(unittest.TestCase):
+    """Dávkové hodnocení proti evaluate_position (bez repetice)"""
+
+    def test_shoda_s_evaluate_position(self):
+        positions = bench.sample_positions(150, seed=3)
+        rng = random.Random(5)
+        for _ in range(50):
+            board = Board()
+            board.pole = nahodna_pole(rng, rng.randint(2, 20))
+            board.refresh_key()
+            positions.append((board, rng.choice(["white", "black"])))
+        boards = [board for board, _ in positions]
+        colors = [color for _, color in positions]
+        scores = batch_eval.evaluate_batch(batch_eval.pack_boards(boards), colors)
+        for (board, color), score in zip(positions, scores):
+            game = Game(HumanPlayer("white"), HumanPlayer("black"), board=board)
+            self.assertAlmostEqual(score, evaluate_position(game, color))
+
+    def test_bitboardy(self):
+        rng = random.Random(9)
+        boards = []
+        for _ in range(30):
+            board = BitBoard()
+            board.pole = nahodna_pole(rng, rng.randint(2, 20))
+            boards.append(board)
+        pole = batch_eval.pack_boards(boards)
+        self.assertTrue((batch_eval.unpack_bitboards(batch_eval.pack_bitboards(boards)) == pole).all())
+        for color in ("white", "black"):
+            self.assertTrue((batch_eval.evaluate_batch(batch_eval.pack_bitboards(boards), color)
+                             == batch_eval.evaluate_batch(pole, color)).all())
+
+
+class ParallelSearchTests(unittest.TestCase):
+    """Testy paralelního prohledávání kořene"""
+
+    def test_stejne_skore_jako_sekvencni(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        game.play_turn(1, 2, 2, 3)
+        sekvencni = Search(game, time_limit=None, max_depth=3)
+        sekvencni.iterate("black")
+        paralelni = ParallelSearch(game, workers=2, time_limit=None, max_depth=3)
+        try:
+            move = paralelni.iterate("black")
+        finally:
+            paralelni.close()
+        self.assertEqual(paralelni.depth, 3)
+        self.assertAlmostEqual(paralelni.best_score, sekvencni.best_score)
+        self.assertIn(move, generate_moves(game.board, "black"))
+
+    def test_nastaveni_hrace(self):
+        with self.assertRaises(ValueError):
+            AIPlayer("white", workers=2, stats=True)
+        ai = AIPlayer("white", time_limit=None, max_depth=2, workers=2, symmetry=True)
+        game = Game(ai, HumanPlayer("black"))
+        try:
+            self.assertIn(ai.get_move(game), generate_moves(game.board, "white"))
+            self.assertTrue(ai.last_search.symmetry)
+        finally:
+            ai.close()
+
+    def test_zruseni_behem_hloubky(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        zrusit = threading.Event()
+        paralelni = ParallelSearch(game, workers=2, time_limit=None, max_depth=64, cancel=zrusit)
+        try:
+            threading.Timer(0.5, zrusit.set).start()
+            start = time.perf_counter()
+            move = paralelni.iterate("white")
+            # Zrušení nečeká na konec rozpracované hloubky
+            self.assertLess(time.perf_counter() - start, 3)
+            self.assertIn(move, generate_moves(game.board, "white"))
+            # Další hledání už zrušené není
+            paralelni.cancel = None
+            paralelni.max_depth = 2
+            paralelni.iterate("white")
+            self.assertEqual(paralelni.depth, 2)
+        finally:
+            paralelni.close()
+
+
+class PerftTests(unittest.TestCase):
+    """Perft proti uloženým počtům listů"""
+
+    def test_ulozene_pozice(self):
+        for name, text in perft.POSITIONS.items():
+            for board_cls in (Board, BitBoard):
+                board, color = perft.parse_position(text, board_cls)
+                counts = [perft.perft(board, color, d) for d in range(1, 4)]
+                self.assertEqual(counts, perft.EXPECTED[name][:3], name)
+
+    def test_divide(self):
+        board, color = perft.parse_position(perft.POSITIONS["skoky"])
+        rozpis = perft.divide(board, color, 4)
+        self.assertEqual(sum(rozpis.values()), perft.EXPECTED["skoky"][3])
+
+    def test_zapis_pozice(self):
+        for text in perft.POSITIONS.values():
+            board, color = perft.parse_position(text)
+            self.assertEqual(perft.position_text(board, color), text)
+        with self.assertRaises(ValueError):
+            perft.parse_position("w.w w")
+
+    def test_regrese_benchmarku(self):
+        rows = bench.compare({"a": 80.0, "b": 95.0}, {"a": 100.0, "b": 100.0}, 0.15)
+        self.assertEqual([r[4] for r in rows], [True, False])
+
+
+class SelfPlayTests(unittest.TestCase):
+    """Testy dávkového hraní bez grafiky"""
+
+    def test_opakovatelnost(self):
+        options = {"node_limit": 60, "time_limit": None}
+        prvni = selfplay.run_games(2, seed=4, workers=1, ai_options=options, max_plies=20)
+        druhy = selfplay.run_games(2, seed=4, workers=1, ai_options=options, max_plies=20)
+        strip = lambda rs: [{k: v for k, v in r.items() if k != "seconds"} for r in rs]
+        self.assertEqual(strip(prvni), strip(druhy))
+        summary = selfplay.summarize(prvni)
+        self.assertEqual(summary["games"], 2)
+        self.assertEqual(summary["white_wins"] + summary["black_wins"] + summary["draws"], 2)
+
+
+
+class SymmetryTests(unittest.TestCase):
+    """Kanonické klíče pod symetriemi kruhové desky"""
+
+    def test_obrazy_maji_stejny_klic_a_tahy(self):
+        rng = random.Random(17)
+        for _ in range(30):
+            board = Board()
+            board.pole = nahodna_pole(rng, rng.randint(2, 12))
+            for x in (0, 7):                # pěšec na poslední řadě by byl proměněn
+                for y, piece in enumerate(board.pole[x]):
+                    if piece and piece.type == "pawn" and x == (7 if piece.color == "white" else 0):
+                        board.pole[x][y] = piece.promoted()
+            board.refresh_key()
+            for color in ("white", "black"):
+                key, _ = canonical_key(board, color)
+                moves = generate_moves(board, color)
+                for t in range(16):
+                    obraz, barva = symetricka_deska(board, t), transform_color(color, t)
+                    self.assertEqual(canonical_key(obraz, barva)[0], key)
+                    self.assertEqual(sorted(transform_move(m, t) for m in moves),
+                                     sorted(generate_moves(obraz, barva)))
+                    for m in moves:
+                        self.assertEqual(untransform_move(transform_move(m, t), t), m)
+
+    def test_klic_udrzovany_deskou(self):
+        board = Board()
+        color = "white"
+        for _ in range(10):
+            board.make_move(generate_moves(board, color)[0])
+            color = "black" if color == "white" else "white"
+        pred = board.sym_key
+        board.refresh_key()
+        self.assertEqual(board.sym_key, pred)
+
+    def test_hledani_se_symetrii(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        search = Search(game, time_limit=None, max_depth=5, symmetry=True)
+        self.assertIn(search.iterate("white"), generate_moves(game.board, "white"))
+        prosta = Search(game, time_limit=None, max_depth=5)
+        prosta.iterate("white")
+        self.assertLess(search.nodes, prosta.nodes)
+
+
+class BookTests(unittest.TestCase):
+    """Testy knihovny zahájení"""
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".book")
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_zapis_a_hledani(self):
+        builder = book.build_from_selfplay(4, plies=6, seed=2, workers=1,
+                                           ai_options={"node_limit": 60, "time_limit": None})
+        builder.write(self.path)
+        kniha = book.OpeningBook(self.path)
+        try:
+            self.assertEqual(len(kniha), len(builder.entries))
+            for (key, move), (weight, total) in builder.entries.items():
+                zaznamy = {m: (w, s) for m, w, s in kniha.probe(key)}
+                self.assertEqual(zaznamy[move][0], weight)
+                self.assertAlmostEqual(zaznamy[move][1], total / weight, places=5)
+            self.assertEqual(kniha.probe(12345), [])
+            board = Board()
+            self.assertIn(kniha.choose(board, "white"), generate_moves(board, "white"))
+        finally:
+            kniha.close()
+
+    def test_skore_hledani_jako_vysledek(self):
+        builder = book.build_from_search(plies=2, node_limit=100)
+        for weight, total in builder.entries.values():
+            self.assertLessEqual(abs(total / weight), 1.0)
+        self.assertEqual(book.score_to_result(10000.0), 1.0)
+        self.assertEqual(book.score_to_result(0.0), 0.0)
+        self.assertLess(book.score_to_result(-1.0), 0.0)
+
+    def test_vaha_vzorku(self):
+        # Jednou vyhraná partie nepřebije tah hraný 500× s průměrem 0.9
+        board = Board()
+        nahoda, overeny = generate_moves(board, "white")[:2]
+        builder = book.BookBuilder()
+        builder.add_position(board, "white", nahoda, 1.0)
+        builder.add_position(board, "white", overeny, 0.9, weight=500)
+        builder.write(self.path)
+        kniha = book.OpeningBook(self.path)
+        try:
+            self.assertEqual(kniha.choose(board, "white"), overeny)
+            self.assertEqual(kniha.choose(board, "white", rng=random.Random(1)), overeny)
+        finally:
+            kniha.close()
+
+    def test_ai_hraje_z_knihovny(self):
+        builder = book.build_from_search(plies=1, node_limit=200)
+        builder.write(self.path)
+        (key, move), = builder.entries
+        ai = AIPlayer("white", time_limit=None, node_limit=50, book=self.path)
+        game = Game(ai, AIPlayer("black"))
+        # Tah je v knihovně v kanonické podobě
+        self.assertEqual(canonical_key(game.board, "white")[0], key)
+        transform = canonical_key(game.board, "white")[1]
+        self.assertEqual(ai.get_move(game), untransform_move(move, transform))
+        self.assertIsNone(ai.last_search)
+        # Knihovnu otevřenou z cesty hráč zavře sám
+        ai.close()
+        self.assertEqual(ai.book, self.path)
+
+    def test_symetricka_pozice(self):
+        # Zrcadlená pozice najde stejný záznam, tah se vrátí do její podoby
+        board = Board()
+        board.make_move(generate_moves(board, "white")[0])
+        builder = book.BookBuilder()
+        move = generate_moves(board, "black")[0]
+        builder.add_position(board, "black", move, 1.0)
+        builder.write(self.path)
+        zrcadlo = symetricka_deska(board, 4)      # y -> -y
+        kniha = book.OpeningBook(self.path)
+        try:
+            self.assertEqual(kniha.choose(board, "black"), move)
+            self.assertEqual(kniha.choose(zrcadlo, "black"), transform_move(move, 4))
+        finally:
+            kniha.close()
+
+    def test_neplatny_soubor(self):
+        with open(self.path, "wb") as f:
+            f.write(b"neni to knihovna")
+        with self.assertRaises(ValueError):
+            book.OpeningBook(self.path)
+
+
+
+class TablebaseTests(unittest.TestCase):
+    """Databáze koncovek proti prohledávání"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        tablebase.generate(2, cls.directory)
+        cls.tb = tablebase.Tablebases(cls.directory, max_pieces=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tb.close()
+        shutil.rmtree(cls.directory)
+
+    def test_rozhodnuti_databazi(self):
+        for databaze in (self.tb, self.directory):
+            pravidla = DrawRules(tablebase=databaze)
+            game = Game(HumanPlayer("white"), HumanPlayer("black"), rules=pravidla)
+            game.board.pole = [[0 for _ in range(8)] for _ in range(8)]
+            game.board.pole[3][2] = Piece("white", "queen")
+            game.board.pole[4][3] = Piece("black", "pawn")     # bílá dáma ho hned sebere
+            game.board.refresh_key()
+            self.assertEqual(game.game_status(),
+                             {"status": "game_over", "winner": "white", "reason": "tablebase"})
+            # Databázi otevřenou z cesty pravidla zavřou, předanou nechají
+            pravidla.close()
+            self.assertEqual(pravidla.tablebase, databaze)
+
+    def _pozice(self, rng):
+        while True:
+            board = Board()
+            board.pole = nahodna_pole(rng, 0)
+            (x1, y1), (x2, y2) = [divmod(sq, 8) for sq in rng.sample(tablebase.DARK, 2)]
+            board.pole[x1][y1] = Piece("white", rng.choice(["pawn", "queen"]))
+            board.pole[x2][y2] = Piece("black", rng.choice(["pawn", "queen"]))
+            if (board.pole[x1][y1].type == "pawn" and x1 == 7) or \
+                    (board.pole[x2][y2].type == "pawn" and x2 == 0):
+                continue
+            board.refresh_key()
+            return board, rng.choice(["white", "black"])
+
+    def test_shoda_s_hledanim(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            board, color = self._pozice(rng)
+            value = self.tb.probe(board, color)
+            if value == 0 or abs(value) > 10:
+                continue
+            game = Game(HumanPlayer("white"), HumanPlayer("black"), board=board)
+            search = Search(game, time_limit=None, max_depth=max(1, abs(value) - 1))
+            search.iterate(color)
+            if search.best_score is None:
+                continue    # vynucený tah
+            vyhra = 10000.0 - (abs(value) - 1)
+            self.assertEqual(search.best_score, vyhra if value > 0 else -vyhra)
+
+    def test_mimo_databazi(self):
+        self.assertIsNone(self.tb.probe(Board(), "white"))
+        self.assertIsNone(self.tb.best_move(Board(), "white"))
+
+    def test_ai_hraje_z_databaze(self):
+        rng = random.Random(3)
+        board, color = self._pozice(rng)
+        while self.tb.probe(board, color) <= 1:
+            board, color = self._pozice(rng)
+        souper = "black" if color == "white" else "white"
+        ai = AIPlayer(color, tablebase=self.tb)
+        game = Game(HumanPlayer("white"), HumanPlayer("black"), board=board)
+        move = ai.get_move(game)
+        self.assertIsNone(ai.last_search)
+        board.make_move(move)
+        self.assertLess(self.tb.probe(board, souper), 0)
+
+
+
+class VisualRendererTests(unittest.TestCase):
+    """Předpočítaná geometrie vykreslování (bez okna, ovladač dummy)"""
+
+    def test_stredy_figurek(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from visual import VisualRenderer
+        renderer = VisualRenderer()
+        for r in range(8):
+            for c in range(8):
+                self.assertEqual(renderer.get_tile_from_click(renderer.piece_centres[r][c]), (r, c))
+        game = Game(HumanPlayer("white"), HumanPlayer("black"))
+        renderer.draw_game_state(game)
+        self.assertEqual(len(renderer.sprites), 2)
+
+
+
+class HeadlessImportTests(unittest.TestCase):
+    """Pravidla a AI se dají použít bez pygame"""
+
+    def test_bez_pygame(self):
+        moduly = "board, piece, game, player, heuristics, search, selfplay, worker"
+        kod = f"import sys, {moduly}; print('pygame' in sys.modules)"
+        vystup = subprocess.run([sys.executable, "-c", kod], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        self.assertEqual(vystup.stdout.strip(), "False")
+
+
+
+class AIWorkerTests(unittest.TestCase):
+    """Hledání AI na pozadí"""
+
+    def test_vysledek_a_prubeh(self):
+        ai = AIPlayer("white", time_limit=None, max_depth=4)
+        game = Game(ai, HumanPlayer("black"))
+        klic = game.board.key
+        hlaseni = []
+        worker = AIWorker(ai, on_progress=lambda *info: hlaseni.append(info))
+        worker.start(game)
+        self.assertTrue(worker.wait(30))
+        move = worker.poll()
+        self.assertIn(move, generate_moves(game.board, "white"))
+        self.assertIsNone(worker.poll())
+        self.assertEqual(game.board.key, klic)      # hledá se nad kopií
+        self.assertEqual([h[2] for h in hlaseni], [1, 2, 3, 4])
+        self.assertEqual(worker.progress, hlaseni[-1])
+
+    def test_zruseni(self):
+        ai = AIPlayer("white", time_limit=None)
+        worker = AIWorker(ai)
+        worker.start(Game(ai, HumanPlayer("black")))
+        self.assertTrue(worker.busy)
+        zacatek = time.perf_counter()
+        worker.cancel()
+        self.assertLess(time.perf_counter() - zacatek, 5)
+        self.assertFalse(worker.busy)
+        self.assertIsNone(worker.poll())
+
+
+
+class PonderTests(unittest.TestCase):
+    """Přemýšlení v čase soupeře"""
+
+    def _po_tahu_ai(self):
+        ai = AIPlayer("white", time_limit=None, max_depth=4, seed=1, ponder=True)
+        game = Game(ai, HumanPlayer("black"))
+        game.play_move(ai.get_move(game))
+        return ai, game
+
+    def test_predpovezeny_tah(self):
+        ai, game = self._po_tahu_ai()
+        predpoved = ai.ponder(game)
+        self.assertIn(predpoved, generate_moves(game.board, "black"))
+        game.play_move(predpoved)
+        move = ai.get_move(game)
+        self.assertEqual(ai.ponder_hits, 1)
+        self.assertEqual(ai.last_search.depth, 4)   # odpověď rovnou z přemýšlení
+        self.assertIn(move, generate_moves(game.board, "white"))
+
+    def test_jiny_tah_souper(self):
+        ai, game = self._po_tahu_ai()
+        predpoved = ai.ponder(game)
+        jiny = next(m for m in generate_moves(game.board, "black") if m != predpoved)
+        game.play_move(jiny)
+        self.assertIn(ai.get_move(game), generate_moves(game.board, "white"))
+        self.assertEqual((ai.ponder_hits, ai.ponder_misses), (0, 1))
+
+    def test_prubezne_na_pozadi(self):
+        ai, game = self._po_tahu_ai()
+        ai.max_depth = 64
+        worker = AIWorker(ai)
+        worker.start(game, ponder=True)
+        self.assertTrue(worker.pondering)
+        time.sleep(0.2)
+        worker.cancel()
+        self.assertIsNone(worker.poll())
+        self.assertIsNotNone(ai._pondered)
+
+
+
+class StatsTests(unittest.TestCase):
+    """Měření hledání a hodnocení"""
+
+    def test_pocitadla_hledani(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        stats = SearchStats()
+        search = Search(game, time_limit=None, max_depth=4, stats=stats)
+        search.iterate("white")
+        self.assertEqual(stats.nodes, search.nodes)
+        self.assertEqual(stats.depth, 4)
+        self.assertEqual(stats.move, search.best_move)
+        self.assertGreater(stats.evals, 0)
+        # Tahy generuje kořen a vnitřní uzly, listy jen hodnotí
+        self.assertGreater(stats.movegen_calls, 1)
+        self.assertLessEqual(stats.movegen_calls - 1 + stats.evals, stats.nodes)
+        self.assertEqual(sorted(stats.branching()), [1, 2, 3])
+        for legal, searched in stats.branching().values():
+            self.assertLessEqual(searched, legal)
+        # Bez stats se hledá stejně
+        bez = Search(game, time_limit=None, max_depth=4)
+        bez.iterate("white")
+        self.assertEqual((bez.nodes, bez.best_score), (search.nodes, search.best_score))
+
+    def test_slozky_hodnoceni(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        stats = SearchStats()
+        self.assertEqual(evaluate_position(game, "white", stats), evaluate_position(game, "white"))
+        self.assertEqual(set(stats.terms), {"material", "movegen", "mobility_threats", "promotion",
+                                            "center", "formation", "repetition"})
+
+    def test_json_lines(self):
+        fd, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(fd)
+        try:
+            ai = AIPlayer("white", time_limit=None, max_depth=3, stats_output=path, term_timing=True)
+            game = Game(ai, AIPlayer("black"))
+            ai.get_move(game)
+            ai.close()
+            with open(path, encoding="utf-8") as f:
+                zaznamy = [json.loads(line) for line in f]
+            self.assertEqual(len(zaznamy), 1)
+            self.assertEqual(zaznamy[0]["color"], "white")
+            self.assertEqual(zaznamy[0]["depth"], 3)
+            self.assertIn("formation", zaznamy[0]["terms"])
+            self.assertEqual(ai.game_stats.totals()["nodes"], ai.last_stats.nodes)
+        finally:
+            os.remove(path)
+
+
+
+class MoveOrderingTests(unittest.TestCase):
+    """Řazení tahů pro alfa-beta"""
+
+    def test_brani_damy_napred(self):
+        board = Board()
+        board.pole = [[0] * 8 for _ in range(8)]
+        board.pole[3][2] = Piece("white", "queen")
+        board.pole[4][3] = Piece("black", "pawn")
+        board.pole[4][1] = Piece("black", "queen")
+        board.refresh_key()
+        moves = generate_moves(board, "white")
+        MoveOrderer().order(board, moves, 0, 1)
+        self.assertEqual(move_path(moves[0]), [(3, 2), (5, 0)])
+        pesec = move_from_path([(3, 2), (5, 4)])
+        MoveOrderer().order(board, moves, 0, 1, hash_move=pesec)
+        self.assertEqual(moves[0], pesec)
+
+    def test_vrazedne_tahy_a_historie(self):
+        board = Board()
+        moves = generate_moves(board, "white")
+        orderer = MoveOrderer()
+        killer, jiny = moves[-1], moves[-2]
+        orderer.cutoff(moves, killer, 0, 3, 2)
+        orderer.order(board, moves, 0, 3)
+        self.assertEqual(moves[0], killer)
+        # V jiném půltahu platí jen historie
+        orderer.cutoff(moves, jiny, 0, 5, 4)
+        orderer.order(board, moves, 0, 7)
+        self.assertEqual(moves[:2], [jiny, killer])
+        stats = orderer.stats()
+        self.assertEqual(stats["cutoffs"], 2)
+        self.assertEqual(stats["first_move_cutoff_rate"], 0.0)    # ani jeden nebyl první
+        self.assertEqual(stats["sources"]["other"], 2)
+
+    def test_mene_uzlu(self):
+        game = Game(AIPlayer("white"), AIPlayer("black"))
+        stats = SearchStats()
+        search = Search(game, time_limit=None, max_depth=6, stats=stats)
+        search.iterate("white")
+        self.assertGreater(stats.ordering["first_move_cutoff_rate"], 0.7)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
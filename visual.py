@@ -20,18 +20,85 @@ class VisualRenderer:
         self.max_radius = 340
         self.radius_step = (self.max_radius - self.min_radius) // self.tile_count
         self.angle_step = 360 // self.tile_count
-        
-    def draw_game_state(self, game):
-        """Vykreslí kompletní stav hry (desku, zprávy)"""
-        self.screen.fill(pygame.Color("black"))
-        self.draw_circular_board(game)
-        self.draw_messages(game)
-        pygame.display.flip()
+        self.piece_radius = self.radius_step // 2 - 4
+
+        # Geometrie se spočítá jen jednou: polygony dlaždic a středy figurek
+        self.tile_polygons = [[self._tile_polygon(r, c) for c in range(self.tile_count)]
+                              for r in range(self.tile_count)]
+        self.piece_centres = [[self._piece_centre(r, c) for c in range(self.tile_count)]
+                              for r in range(self.tile_count)]
+        self.background = self._render_background()
+        self.sprites = {}   # (barva, typ) -> předkreslená figurka
+
+        # Oblasti obrazovky, které se překreslují samostatně
+        self.board_rect = pygame.Rect(self.CENTER[0] - self.max_radius, self.CENTER[1] - self.max_radius,
+                                      2 * self.max_radius + 1, 2 * self.max_radius + 1)
+        self.messages_rect = pygame.Rect(0, self.HEIGHT - 80, self.WIDTH, 80)
+
+    def _tile_polygon(self, r, c):
+        """Body dlaždice: vnější okraj a vnitřní okraj v opačném pořadí"""
+        inner = self.min_radius + r * self.radius_step
+        outer = inner + self.radius_step
+        start_angle = c * self.angle_step
+        angles = [math.radians(start_angle + i * (self.angle_step / 5)) for i in range(6)]
+        points = [(self.CENTER[0] + outer * math.cos(a), self.CENTER[1] + outer * math.sin(a))
+                  for a in angles]
+        points += [(self.CENTER[0] + inner * math.cos(a), self.CENTER[1] + inner * math.sin(a))
+                   for a in reversed(angles)]
+        return points
+
+    def _piece_centre(self, r, c):
+        inner = self.min_radius + r * self.radius_step
+        radius_mid = (inner + inner + self.radius_step) // 2
+        angle_mid = math.radians(c * self.angle_step + self.angle_step / 2)
+        return (int(self.CENTER[0] + radius_mid * math.cos(angle_mid)),
+                int(self.CENTER[1] + radius_mid * math.sin(angle_mid)))
+
+    def _render_background(self):
+        """Předkreslí pozadí s deskou do vlastního povrchu"""
+        colors = [pygame.Color("burlywood"), pygame.Color("saddlebrown")]
+        surface = pygame.Surface((self.WIDTH, self.HEIGHT)).convert()
+        surface.fill(pygame.Color("black"))
+        for r in range(self.tile_count):
+            for c in range(self.tile_count):
+                pygame.draw.polygon(surface, colors[(r + c) % 2], self.tile_polygons[r][c])
+        return surface
+
+    def _sprite(self, piece):
+        """Obrázek figurky (kreslí se jen poprvé, pak z mezipaměti)"""
+        key = (piece.color, piece.type)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            size = 2 * self.piece_radius + 1
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA).convert_alpha()
+            piece_color = pygame.Color("white") if piece.color == "white" else pygame.Color("black")
+            pygame.draw.circle(sprite, piece_color, (self.piece_radius, self.piece_radius), self.piece_radius)
+            # Označí dámy
+            if piece.type == "queen":
+                pygame.draw.circle(sprite, pygame.Color("gold"), (self.piece_radius, self.piece_radius), 8)
+            self.sprites[key] = sprite
+        return sprite
+
+    def draw_game_state(self, game, parts=("board", "messages"), ai_info=None):
+        """
+        Vykreslí stav hry a obnoví na obrazovce jen změněné oblasti.
+        parts: co překreslit - "board" (deska), "messages" (zprávy a hráč na tahu).
+        ai_info: průběh hledání AI (tah, skóre, hloubka, uzly) nebo None.
+        Vrací seznam obnovených obdélníků.
+        """
+        rects = []
+        if "board" in parts:
+            self.draw_circular_board(game)
+            rects.append(self.board_rect)
+        if "messages" in parts:
+            self.draw_messages(game, ai_info)
+            rects.append(self.messages_rect)
+        pygame.display.update(rects)
+        return rects
     
-    def draw_messages(self, game):
+    def draw_messages(self, game, ai_info=None):
         """Vykreslí oblast zpráv a informace o aktuálním hráči"""
-        pygame.draw.rect(self.screen, pygame.Color("lightgrey"), 
-                        (0, self.HEIGHT-80, self.WIDTH, 80))
+        pygame.draw.rect(self.screen, pygame.Color("lightgrey"), self.messages_rect)
         
         for i, msg in enumerate(game.messages):
             text = self.FONT.render(msg, True, pygame.Color("black"))
@@ -40,57 +107,31 @@ class VisualRenderer:
         turn_info = self.FONT.render(f"Na tahu: {game.current_player_obj().color}", 
                                     True, pygame.Color("blue"))
         self.screen.blit(turn_info, (self.WIDTH - 220, self.HEIGHT - 75))
+
+        # Průběh hledání AI na pozadí
+        if ai_info is not None:
+            move, score, depth, nodes = ai_info
+            ai_info = self.FONT.render(f"AI: hloubka {depth}, {nodes} uzlů", True, pygame.Color("blue"))
+            self.screen.blit(ai_info, (self.WIDTH - 220, self.HEIGHT - 55))
     
     def draw_circular_board(self, game):
-        """Vykreslí kruhovou desku se všemi figurkami"""
-        colors = [pygame.Color("burlywood"), pygame.Color("saddlebrown")]
-      
-        for r in range(self.tile_count):
-            inner = self.min_radius + r * self.radius_step
-            outer = inner + self.radius_step
-            
-            for c in range(self.tile_count):
-                start_angle = c * self.angle_step
-                points = []
-                
-                # Vykreslí body vnějšího okraje
-                for i in range(6):
-                    angle = math.radians(start_angle + i * (self.angle_step / 5))
-                    x = self.CENTER[0] + outer * math.cos(angle)
-                    y = self.CENTER[1] + outer * math.sin(angle)
-                    points.append((x, y))
-                
-                # Vykreslí body vnitřního okraje (v opačném pořadí)
-                for i in range(5, -1, -1):
-                    angle = math.radians(start_angle + i * (self.angle_step / 5))
-                    x = self.CENTER[0] + inner * math.cos(angle)
-                    y = self.CENTER[1] + inner * math.sin(angle)
-                    points.append((x, y))
-
-                # Vykreslí dlaždici
-                pygame.draw.polygon(self.screen, colors[(r + c) % 2], points)
-                
-                # Vykreslí figurku, pokud je přítomna
-                piece = game.board.pole[r][c]
-                if piece != 0:
-                    angle_mid = math.radians(start_angle + self.angle_step / 2)
-                    radius_mid = (inner + outer) // 2
-                    fx = self.CENTER[0] + radius_mid * math.cos(angle_mid)
-                    fy = self.CENTER[1] + radius_mid * math.sin(angle_mid)
-                    
-                    # Vykreslí figurku
-                    piece_color = pygame.Color("white") if piece.color == "white" else pygame.Color("black")
-                    pygame.draw.circle(self.screen, piece_color, (int(fx), int(fy)), self.radius_step // 2 - 4)
-                    
-                    # Označí dámy
-                    if piece.type == "queen":
-                        pygame.draw.circle(self.screen, pygame.Color("gold"), (int(fx), int(fy)), 8)
-                    
-                    # Zvýrazní vybranou figurku
-                    player = game.current_player_obj()
-                    if not Player.is_ai_player(player) and hasattr(player, "_selected") and player._selected == (r, c):
-                        pygame.draw.circle(self.screen, pygame.Color("red"), 
-                                         (int(fx), int(fy)), self.radius_step // 2, 3)
+        """Vykreslí kruhovou desku se všemi figurkami (pozadí je předkreslené)"""
+        self.screen.blit(self.background, self.board_rect, self.board_rect)
+        player = game.current_player_obj()
+        selected = None
+        if not Player.is_ai_player(player):
+            selected = getattr(player, "_selected", None)
+
+        for r, row in enumerate(game.board.pole):
+            for c, piece in enumerate(row):
+                if piece == 0:
+                    continue
+                fx, fy = self.piece_centres[r][c]
+                self.screen.blit(self._sprite(piece), (fx - self.piece_radius, fy - self.piece_radius))
+                # Zvýrazní vybranou figurku
+                if selected == (r, c):
+                    pygame.draw.circle(self.screen, pygame.Color("red"), 
+                                       (fx, fy), self.radius_step // 2, 3)
     
     def get_tile_from_click(self, pos):
         """Převede souřadnice obrazovky na souřadnice desky"""
@@ -118,8 +159,10 @@ class VisualRenderer:
         
         if winner == "white":
             message = "BÍLÝ HRÁČ VYHRÁL!"
-        else:
+        elif winner == "black":
             message = "ČERNÝ HRÁČ VYHRÁL!"
+        else:
+            message = "REMÍZA!"
         
         color = (255, 255, 255)  # Bílá
         
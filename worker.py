@@ -0,0 +1,101 @@
+# worker.py
+# Hledání tahu AI na pozadí, aby okno hry nikdy nezamrzlo.
+# Smyčka hry jen spustí hledání (start), v každém snímku se zeptá na
+# výsledek (poll, neblokuje) a může ho kdykoliv zrušit (cancel).
+# Hledá se ve vlákně nad kopií hry (Game.snapshot) - deska, kterou
+# kreslí okno, se během hledání nemění.
+
+import threading
+
+
+class _Job:
+    """Jedno hledání: příznak zrušení a výsledek (každé hledání má vlastní)"""
+
+    def __init__(self, ponder):
+        self.ponder = ponder
+        self.cancel = threading.Event()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.thread = None
+
+
+class AIWorker:
+    """
+    Hledání tahu jednoho AI hráče ve vlákně na pozadí.
+    S ponder=True hráč přemýšlí v čase soupeře (AIPlayer.ponder); takové
+    hledání nevrací tah a před vlastním tahem se zruší.
+    progress je poslední hlášení hledání (tah, skóre, hloubka, uzly) nebo None;
+    on_progress se volá z vlákna hledání po každé dokončené hloubce.
+    """
+
+    def __init__(self, player, on_progress=None):
+        self.player = player
+        self.on_progress = on_progress
+        self.progress = None
+        self._job = None
+
+    @property
+    def busy(self):
+        """Běží hledání?"""
+        return self._job is not None and not self._job.done.is_set()
+
+    @property
+    def pondering(self):
+        """Běží (nebo doběhlo) přemýšlení v čase soupeře?"""
+        return self._job is not None and self._job.ponder
+
+    def start(self, game, ponder=False):
+        """
+        Spustí hledání tahu pro aktuální pozici hry, s ponder=True přemýšlení
+        v čase soupeře. Předchozí hledání se zruší a počká se na něj
+        (hráč a jeho tabulka nesmí hledat ve dvou vláknech najednou).
+        """
+        self.cancel()
+        self.progress = None
+        job = _Job(ponder)
+        job.thread = threading.Thread(target=self._run, args=(game.snapshot(), job),
+                                      name=f"AI {self.player.color}", daemon=True)
+        self._job = job
+        job.thread.start()
+
+    def _run(self, game, job):
+        task = self.player.ponder if job.ponder else self.player.get_move
+        try:
+            job.result = task(game, cancel=job.cancel, progress=lambda *info: self._report(job, info))
+        except Exception as e:     # předá se do poll() v hlavním vlákně
+            job.error = e
+        job.done.set()
+
+    def _report(self, job, info):
+        if job is not self._job:
+            return                  # hlášení zrušeného hledání
+        self.progress = info
+        if self.on_progress is not None:
+            self.on_progress(*info)
+
+    def poll(self):
+        """
+        Neblokující dotaz: vrátí nalezený tah (jen jednou), jinak None.
+        Chyba z hledání se vyvolá zde.
+        """
+        job = self._job
+        if job is None or job.ponder or not job.done.is_set():
+            return None
+        self._job = None
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def wait(self, timeout=None):
+        """Počká na dokončení hledání; vrátí True, je-li výsledek připraven"""
+        return self._job is not None and self._job.done.wait(timeout)
+
+    def cancel(self, wait=True):
+        """Zruší běžící hledání; s wait=True počká na ukončení vlákna"""
+        job, self._job = self._job, None
+        if job is None:
+            return
+        job.cancel.set()
+        if wait:
+            job.thread.join()
@@ -0,0 +1,95 @@
+# zobrist.py
+# Zobristovo hashování pozic a transpoziční tabulka pro prohledávání.
+# Klíč desky je XOR náhodných 64bitových čísel pro každou dvojici
+# (figurka, pole); při tahu se aktualizuje jen XORem změněných polí.
+
+import random
+
+# Pevné semínko - klíče musí být stejné ve všech procesech i bězích
+_rng = random.Random(0x5A0B1575)
+
+# Indexováno kódem figurky (Piece.code) a polem
+PIECE_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(64)) for _ in range(4))
+SIDE_KEY = _rng.getrandbits(64)     # přidá se, je-li na tahu černý
+
+
+def piece_key(piece, x, y):
+    """Klíč jedné figurky na poli [x][y]"""
+    return PIECE_KEYS[piece.code][x * 8 + y]
+
+
+def board_key(board):
+    """Spočítá klíč rozmístění figurek od nuly (bez hráče na tahu)"""
+    key = 0
+    for x, row in enumerate(board.pole):
+        for y, piece in enumerate(row):
+            if piece != 0:
+                key ^= piece_key(piece, x, y)
+    return key
+
+
+def position_key(board, color):
+    """Klíč pozice včetně hráče na tahu"""
+    return board.key ^ SIDE_KEY if color == "black" else board.key
+
+
+# Typy mezí uloženého skóre
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Tabulka pevné velikosti (mocnina dvou) indexovaná spodními bity klíče.
+    Záznam: (klíč, hloubka, typ meze, skóre, nejlepší tah, generace).
+    Nahrazování: záznam ze starší generace (dřívějšího hledání) nebo s menší
+    či stejnou hloubkou se přepíše, hlubší záznam z aktuálního hledání zůstane.
+    """
+
+    def __init__(self, size=1 << 18):
+        if size & (size - 1):
+            raise ValueError("Velikost transpoziční tabulky musí být mocnina dvou.")
+        self.size = size
+        self.mask = size - 1
+        self.entries = [None] * size
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Označí začátek nového hledání (starší záznamy lze přepsat)"""
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * self.size
+        self.hits = self.misses = self.stores = self.replacements = 0
+
+    def probe(self, key):
+        """Vrátí (hloubka, typ meze, skóre, tah) pro klíč nebo None"""
+        entry = self.entries[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, bound, score, move):
+        index = key & self.mask
+        entry = self.entries[index]
+        if entry is not None:
+            if entry[0] != key and entry[5] == self.generation and entry[1] > depth:
+                return
+            if entry[0] != key:
+                self.replacements += 1
+            elif move is None:
+                move = entry[4]         # zachová tah ze stejné pozice
+        self.entries[index] = (key, depth, bound, score, move, self.generation)
+        self.stores += 1
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def __len__(self):
+        return sum(1 for entry in self.entries if entry is not None)